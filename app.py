@@ -1,10 +1,23 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, wait
+
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
-from textblob import TextBlob
+
+import data
+import exports
+import figures
+import profiling
+from downsample import line_trace
+from feedback import PAGE_SIZE
+from forecast import forecast_frame
+from refresh import REFRESH_INTERVAL, get_refresher
+from scheduler import Task, get_scheduler
+from sentiment import SENTIMENT_LABELS
+from store import freeze, get_store
+from wordcloud_service import get_renderer
 
 # Configurer la page du tableau de bord avec un thème personnalisé
 st.set_page_config(page_title="Students Employability Dashboard", layout="wide")
@@ -45,485 +58,703 @@ st.markdown("""
             color: #4B8BBE;
             margin-bottom: 20px;
         }
+
+        /* Style pour les boutons de téléchargement */
+        .stDownloadButton button {
+            background-color: #6C63FF;
+            color: white;
+            border-radius: 5px;
+            padding: 10px 20px;
+            font-size: 16px;
+        }
     </style>
 """, unsafe_allow_html=True)
 
 # Titre principal
 st.markdown("<h1 class='main-title'>Student Employability Monitoring</h1>", unsafe_allow_html=True)
 
-# Générer des données fictives pour le tableau de bord
-np.random.seed(42)
-sectors = ["Tech", "Finance", "Healthcare", "Education", "Consulting", "Engineering"]
-placement_rates = np.random.randint(50, 90, size=len(sectors))
-years = [2020, 2021, 2022, 2023]
-cohorts = ["Cohort A", "Cohort B", "Cohort C", "Cohort D"]
-stakeholders = ["Students", "Employers", "University"]
-
-# Palette de couleurs personnalisée
-colors = px.colors.qualitative.Set2
-
-# Section 1: Vue d'ensemble avec filtres dynamiques
-st.markdown("<h2 class='section-title'>Overview of Placement Rates</h2>", unsafe_allow_html=True)
-
-# Ajouter un filtre pour sélectionner un secteur spécifique (appartient au pie chart)
-selected_sector = st.multiselect("Select Sector(s)", sectors, default=sectors)
-
-# Filtrer les données en fonction des secteurs sélectionnés
-df_overview = pd.DataFrame({
-    "Sector": sectors,
-    "Placement Rate (%)": placement_rates
-})
-df_filtered = df_overview[df_overview["Sector"].isin(selected_sector)] if selected_sector else df_overview.copy()
-
-# Graphique en anneau pour les taux de placement par secteur
-fig1 = px.pie(df_filtered, values='Placement Rate (%)', names='Sector', hole=0.4, 
-              title="Placement Rate by Sector",
-              color_discrete_sequence=colors)
-fig1.update_traces(textinfo='percent+label', textposition='inside',
-                   marker=dict(line=dict(color='#000000', width=2)))
-fig1.update_layout(showlegend=True, margin=dict(t=50, b=0, l=0, r=0))
-
-# Générer des données fictives pour les noms de métiers (exemple pour la démonstration)
-job_titles = ["Data Scientist", "Software Engineer", "Financial Analyst", "Healthcare Manager", 
-              "Teacher", "Consultant", "Civil Engineer", "Mechanical Engineer", 
-              "Project Manager", "Data Analyst", "Marketing Specialist", "Researcher"]
-job_titles *= 10  # Augmenter la fréquence des métiers
-
-# Créer un nuage de mots avec un design harmonisé
-wordcloud = WordCloud(width=800, height=400, background_color='white', colormap='plasma').generate(" ".join(job_titles))
-
-# Afficher côte à côte le pie chart et le word cloud
-col1, col2 = st.columns(2)
-
-with col1:
-    st.plotly_chart(fig1, use_container_width=True)
-
-with col2:
-    # Titre distinct pour le word cloud
-    st.subheader("Word Cloud of Job Titles")
-    # Afficher le nuage de mots dans Streamlit
-    st.image(wordcloud.to_array(), use_column_width=True)
-
-# Statistiques clés avec mise en valeur
-st.subheader("Key Statistics")
-
-# Créer une palette de couleurs harmonisée pour les statistiques
-background_colors = ["#6C63FF", "#FF6347", "#FFD700"]
-text_color = "white"
-
-# Liste des statistiques clés
-metrics = [
-    {
-        "title": "Overall Placement Rate",
-        "value": f"{np.mean(df_filtered['Placement Rate (%)']):.1f}%",
-        "background_color": background_colors[0],
-        "icon": "fa-line-chart"
-    },
-    {
-        "title": "Highest Placement Sector",
-        "value": f"{df_filtered['Sector'].iloc[np.argmax(df_filtered['Placement Rate (%)'])]} ({np.max(df_filtered['Placement Rate (%)'])}%)",
-        "background_color": background_colors[1],
-        "icon": "fa-arrow-up"
-    },
-    {
-        "title": "Lowest Placement Sector",
-        "value": f"{df_filtered['Sector'].iloc[np.argmin(df_filtered['Placement Rate (%)'])]} ({np.min(df_filtered['Placement Rate (%)'])}%)",
-        "background_color": background_colors[2],
-        "icon": "fa-arrow-down"
-    }
-]
+# Mesure de la durée de chaque section pour cette exécution
+profiling.start_run()
+
+# Les jeux de données sont fournis par la couche d'accès aux données (data.py),
+# mise en cache entre les reruns dans le magasin partagé entre les sessions (store.py)
+stakeholders = data.STAKEHOLDERS
+
+# Mode « sections à la demande » : chaque section est placée dans un onglet et
+# n'est calculée que lorsque l'onglet est ouvert (désactivable avec LAZY_SECTIONS=0)
+LAZY_SECTIONS = os.environ.get("LAZY_SECTIONS", "1") != "0"
+
+# Invalidation explicite du cache des données (et des artefacts partagés)
+if st.sidebar.button("Refresh data"):
+    data.invalidate()
+    get_store().invalidate(("artifact",))
+
+# Rapport d'ingestion des enregistrements de placement (sources réelles uniquement)
+data.load_placements()
+if data.DEFAULT_SOURCE in data.ingest_stats:
+    st.sidebar.caption(f"Placement records: {data.ingest_stats[data.DEFAULT_SOURCE].summary()}")
+
+# Répertoires de données surveillés : les nouveaux fichiers sont ingérés de
+# façon incrémentale et les sessions ouvertes sont rafraîchies
+refresher = get_refresher()
+
+
+@st.fragment(run_every=REFRESH_INTERVAL)
+def watch_data():
+    version = refresher.poll()
+    if st.session_state.setdefault("_data_version", version) != version:
+        st.session_state["_data_version"] = version
+        # Nouvelles données : réexécution complète de la page de cette session
+        st.rerun()
+    if refresher.last_update:
+        st.caption(f"Last data update: {refresher.last_update}")
+
+
+if refresher.watching:
+    with st.sidebar:
+        watch_data()
+
+
+# Jeu de données surveillé dont dépend chaque artefact : une mise à jour
+# incrémentale (refresh.py) ne rend obsolètes que les artefacts concernés
+ARTIFACT_DATA = {
+    "sector_pie": "placements",
+    "wordcloud": "placements",
+    "geo": "placements",
+    "detailed_analysis": "placements",
+    "market_trends": "placements",
+    "sentiment": "comments",
+}
 
-# Afficher les statistiques en utilisant les colonnes de Streamlit avec un style réactif
-cols = st.columns(len(metrics))
 
-for col, metric in zip(cols, metrics):
-    col.markdown(
-        f"""
-        <div style='background-color: {metric['background_color']}; padding: 20px; border-radius: 10px; text-align: center;'>
-            <h3 style='color: {text_color}; margin-bottom: 10px;'>{metric['title']}</h3>
-            <i style='color: {text_color}; font-size: 30px; margin-bottom: 10px;' class="fa {metric['icon']}"></i>
-            <p style='font-size: 35px; color: {text_color}; font-weight: bold; margin: 0;'>{metric['value']}</p>
-        </div>
-        """, unsafe_allow_html=True
+def shared_artifact(name, builder, *args):
+    """Artefacts (figures, images) d'une section, partagés entre les sessions.
+
+    Ils sont calculés à la première ouverture de la section (par n'importe
+    quelle session), puis réutilisés tant que les paramètres `args` et la
+    version des données dont ils dépendent ne changent pas. Une session ne
+    conserve que l'état de ses filtres.
+    """
+    return get_store().get_or_build(artifact_key(name, *args), builder, *args)
+
+
+def artifact_key(name, *args):
+    version = refresher.versions.get(ARTIFACT_DATA.get(name))
+    return ("artifact", name, version, freeze(args))
+
+
+def artifact_task(name, builder, depends=(), args=()):
+    """Tâche de l'ordonnanceur calculant l'artefact partagé `name` (ignorée s'il est en cache)."""
+    return Task(name, lambda: shared_artifact(name, builder, *args), depends,
+                cached=lambda: artifact_key(name, *args) in get_store())
+
+
+def add_forecast(fig, wide, colors):
+    """Superpose la prévision (ligne pointillée et bande à 95 %) de chaque série de `wide`."""
+    forecasts = forecast_frame(wide)
+    last = wide.ffill().iloc[-1]
+    for i, (series, df_series) in enumerate(forecasts.groupby("series", sort=False)):
+        # La prévision part de la dernière valeur observée de la série
+        x = [wide.index[-1], *df_series["time"]]
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Scatter(
+            x=x + x[::-1],
+            y=[last[series], *df_series["upper"], *df_series["lower"][::-1], last[series]],
+            fill='toself', fillcolor=color, opacity=0.2, line=dict(width=0),
+            hoverinfo='skip', showlegend=False, legendgroup=series
+        ))
+        fig.add_trace(go.Scatter(
+            x=x, y=[last[series], *df_series["forecast"]],
+            mode='lines+markers', name=f"{series} (forecast)", legendgroup=series,
+            line=dict(color=color, dash='dash'), showlegend=False
+        ))
+
+
+def build_sector_pie(filters):
+    # Palette de couleurs personnalisée
+    colors = px.colors.qualitative.Set2
+
+    # Taux de placement des étudiants retenus par la barre de filtres, par agrégation du cube
+    df_filtered = data.load_overview(filters=filters)
+    students, placed, overall_rate = data.load_cube().total(**filters)
+
+    # Graphique en anneau pour les taux de placement par secteur
+    fig1 = px.pie(df_filtered, values='Placement Rate (%)', names='Sector', hole=0.4,
+                  title="Placement Rate by Sector",
+                  color_discrete_sequence=colors)
+    fig1.update_traces(textinfo='percent+label', textposition='inside',
+                       marker=dict(line=dict(color='#000000', width=2)))
+    fig1.update_layout(showlegend=True, margin=dict(t=50, b=0, l=0, r=0))
+    return figures.compact(fig1), df_filtered, overall_rate
+
+
+def build_wordcloud(filters):
+    # Fréquences des noms de métiers pour le nuage de mots
+    job_title_frequencies = data.load_job_title_frequencies(filters=filters)
+
+    # Créer un nuage de mots avec un design harmonisé (rendu mis en cache)
+    return get_renderer().render(job_title_frequencies, width=800, height=400,
+                                 background_color='white', colormap='plasma')
+
+
+def build_geo(filters):
+    # Recrues agrégées côté serveur par pays, région ou hexagone : la taille de la
+    # couche envoyée au navigateur est bornée par le nombre de zones
+    layer = data.load_geo_layer(filters=filters)
+    df_geo = layer.frame
+
+    # Créer une carte choroplèthe interactive avec Plotly
+    with profiling.timed("px.choropleth"):
+        fig = px.choropleth(df_geo,
+                            geojson=layer.geojson,
+                            locations='location',
+                            locationmode='ISO-3' if layer.geojson is None else None,
+                            color='Recruits',
+                            hover_name='label',
+                            title="Global Recruitment Heatmap",
+                            color_continuous_scale='Plasma')
+
+    # Mettre à jour la disposition pour agrandir la carte
+    fig.update_layout(
+        geo=dict(
+            scope='world',
+            projection_type='natural earth',
+            showcountries=True
+        ),
+        width=1300,  # Largeur de la carte
+        height=800   # Hauteur de la carte
     )
+    return figures.compact(fig)
+
+
+def build_detailed_analysis(filters):
+    # Palette de couleurs améliorée (celle du modèle partagé)
+    colors = figures.COLORS
+
+    # Taux de placement par cohorte et par année
+    df_cohorts = data.load_cohorts(filters=filters)
+
+    # Graphique de ligne pour les tendances des taux de placement par cohorte
+    fig2 = px.line(df_cohorts, x="Year", y="Placement Rate (%)", color="Cohort", markers=True,
+                   title="Placement Rate Trends by Cohort",
+                   color_discrete_sequence=colors)
+    # Prévision pour l'année suivante
+    add_forecast(fig2, df_cohorts.pivot(index="Year", columns="Cohort", values="Placement Rate (%)"), colors)
+    # Polices, fonds et axes sont fournis par le modèle partagé (figures.py)
+    fig2.update_layout(xaxis_title="Year", yaxis_title="Placement Rate (%)",
+                       plot_bgcolor='#FAFAFA', hovermode="x unified")
+
+    # Taux de placement par niveau d'études
+    df_degree = data.load_degree(filters=filters)
+
+    # Graphique en barres pour les taux de placement par niveau d'études
+    fig_degree = px.bar(df_degree, x="Degree Level", y="Placement Rate (%)",
+                        title="Placement Rate by Degree Level",
+                        color="Degree Level",
+                        color_discrete_sequence=colors)
+    fig_degree.update_layout(xaxis_title="Degree Level", yaxis_title="Placement Rate (%)",
+                             plot_bgcolor='#FAFAFA', hovermode="x unified")
+    return figures.compact(fig2), figures.compact(fig_degree)
+
+
+def build_performance():
+    # Satisfaction des parties prenantes, par catégorie et budget utilisé
+    df_performance, df_categories, budget_used = data.load_performance()
+
+    # Graphique en radar pour la satisfaction des parties prenantes
+    fig3 = go.Figure()
+
+    fig3.add_trace(go.Scatterpolar(
+        r=df_performance['Satisfaction Score (%)'],
+        theta=df_performance['Stakeholder'],
+        fill='toself',
+        name='Satisfaction Score',
+        marker=dict(color='#FF6347')
+    ))
 
-# section 2
-# Exemples de données géographiques fictives (Remplacer par vos données réelles)
-geo_data = {
-    "Country": ["Morocco", "France", "USA", "Germany", "Canada",
-                "Senegal", "Ivory Coast", "Nigeria", "Kenya", "Ghana", "Mali", "South Africa", "Cameroon"],
-    "Recruits": [150, 80, 35, 50, 70, 
-                 90, 55, 120, 75, 65, 40, 85, 40],
-    "Lat": [31.7917, 46.6034, 37.0902, 51.1657, 56.1304, 
-            14.4974, 7.539989, 9.0820, -1.2921, 7.9465, 12.6392, -30.5595, 3.8480],
-    "Lon": [-7.0926, 1.8883, -95.7129, 10.4515, -106.3468, 
-            -14.4524, -5.5471, 8.6753, 36.8219, -1.0232, -8.0029, 22.9375, 11.5021]
-}
+    fig3.update_layout(
+        polar=dict(
+            radialaxis=dict(visible=True, range=[0, 100]),
+        ),
+        showlegend=False,
+        title="Stakeholder Satisfaction",
+        margin=dict(l=40, r=40, t=40, b=40),
+    )
 
-df_geo = pd.DataFrame(geo_data)
-
-# Créer une carte interactive avec Plotly
-fig = px.scatter_geo(df_geo, 
-                     lat='Lat', 
-                     lon='Lon', 
-                     size='Recruits', 
-                     hover_name='Country',
-                     title="Global Recruitment Heatmap",
-                     color='Recruits',
-                     size_max=50)
-
-# Mettre à jour la disposition pour agrandir la carte
-fig.update_layout(
-    geo=dict(
-        scope='world',
-        projection_type='natural earth'
-    ),
-    width=1300,  # Largeur de la carte
-    height=800   # Hauteur de la carte
-)
-
-# Afficher la carte dans Streamlit
-st.markdown("<h2 class='section-title'>Global Recruitment Heatmap</h2>", unsafe_allow_html=True)
-st.plotly_chart(fig, use_container_width=True)
-
-
-# Section 3: Analyse détaillée avec prévisions
-st.markdown("<h2 class='section-title'>Detailed Placement Analysis</h2>", unsafe_allow_html=True)
-
-# Palette de couleurs améliorée
-colors = ["#636EFA", "#EF553B", "#00CC96", "#AB63FA", "#FFA15A"]
-
-# Générer des données fictives pour les cohortes et les années
-df_cohorts = pd.DataFrame({
-    "Year": np.repeat(years, len(cohorts)),
-    "Cohort": cohorts * len(years),
-    "Placement Rate (%)": np.random.randint(50, 90, size=len(years) * len(cohorts))
-})
-
-# Graphique de ligne pour les tendances des taux de placement par cohorte
-fig2 = px.line(df_cohorts, x="Year", y="Placement Rate (%)", color="Cohort", markers=True,
-               title="Placement Rate Trends by Cohort",
-               color_discrete_sequence=colors)
-fig2.update_layout(xaxis_title="Year", yaxis_title="Placement Rate (%)",
-                   plot_bgcolor='#FAFAFA',
-                   paper_bgcolor='#FAFAFA',
-                   font=dict(family="Arial, sans-serif", size=12, color="#2a2a2a"),
-                   title_font=dict(size=16, color="#2a2a2a", family="Arial, sans-serif"),
-                   legend_title=dict(font=dict(size=14, color="#2a2a2a")),
-                   xaxis=dict(showline=True, linewidth=2, linecolor='black'),
-                   yaxis=dict(showline=True, linewidth=2, linecolor='black'),
-                   hovermode="x unified")
-
-# Générer des données pour les taux de placement par niveau d'études
-df_degree = pd.DataFrame({
-    "Degree Level": ["Bachelor", "Master", "PhD"],
-    "Placement Rate (%)": [75, 85, 70]
-})
-
-# Graphique en barres pour les taux de placement par niveau d'études
-fig_degree = px.bar(df_degree, x="Degree Level", y="Placement Rate (%)",
-                    title="Placement Rate by Degree Level",
-                    color="Degree Level",
-                    color_discrete_sequence=colors)
-fig_degree.update_layout(xaxis_title="Degree Level", yaxis_title="Placement Rate (%)",
-                         plot_bgcolor='#FAFAFA',
-                         paper_bgcolor='#FAFAFA',
-                         font=dict(family="Arial, sans-serif", size=12, color="#2a2a2a"),
-                         title_font=dict(size=16, color="#2a2a2a", family="Arial, sans-serif"),
-                         legend_title=dict(font=dict(size=14, color="#2a2a2a")),
-                         xaxis=dict(showline=True, linewidth=2, linecolor='black'),
-                         yaxis=dict(showline=True, linewidth=2, linecolor='black'),
-                         hovermode="x unified")
-
-# Afficher côte à côte les graphiques de la section 2
-col1, col2 = st.columns(2)
-
-with col1:
-    st.plotly_chart(fig2, use_container_width=True)
-
-with col2:
-    st.plotly_chart(fig_degree, use_container_width=True)
-
-# Section 4: Performance du Career Center avec rapports téléchargeables
-st.markdown("<h2 class='section-title'>Career Center Performance</h2>", unsafe_allow_html=True)
-
-# Générer des données fictives pour la satisfaction des parties prenantes
-satisfaction_scores = np.random.randint(70, 100, size=len(stakeholders))
-budget_used = np.random.uniform(50, 100)
-
-df_performance = pd.DataFrame({
-    "Stakeholder": stakeholders,
-    "Satisfaction Score (%)": satisfaction_scores
-})
-
-# Graphique en radar pour la satisfaction des parties prenantes
-fig3 = go.Figure()
-
-fig3.add_trace(go.Scatterpolar(
-    r=df_performance['Satisfaction Score (%)'],
-    theta=df_performance['Stakeholder'],
-    fill='toself',
-    name='Satisfaction Score',
-    marker=dict(color='#FF6347')
-))
-
-fig3.update_layout(
-    polar=dict(
-        radialaxis=dict(visible=True, range=[0, 100]),
-    ),
-    showlegend=False,
-    title="Stakeholder Satisfaction",
-    margin=dict(l=40, r=40, t=40, b=40),
-)
-
-# Ajout d'un graphique Scatterpolar pour la satisfaction moyenne par catégorie
-categories = ["Communication", "Support", "Resources", "Events"]
-category_scores = np.random.randint(70, 100, size=len(categories))
-
-fig4 = go.Figure()
-
-fig4.add_trace(go.Scatterpolar(
-    r=category_scores,
-    theta=categories,
-    fill='toself',
-    name='Category Satisfaction',
-    marker=dict(color='#6C63FF')
-))
-
-fig4.update_layout(
-    polar=dict(
-        radialaxis=dict(visible=True, range=[0, 100]),
-    ),
-    showlegend=False,
-    title="Category Satisfaction",
-    margin=dict(l=40, r=40, t=40, b=40),
-)
-
-# Afficher les deux graphiques côte à côte
-col1, col2 = st.columns(2)
-
-with col1:
-    st.plotly_chart(fig3, use_container_width=True)
-
-with col2:
-    st.plotly_chart(fig4, use_container_width=True)
-
-# Affichage du budget utilisé avec amélioration esthétique
-st.markdown(
-    f"""
-    <div style='background-color: #FFD700; padding: 10px; border-radius: 5px; text-align: center;'>
-        <h2 style='color: #000;'>Budget Utilized: {budget_used:.1f}% of Total</h2>
-    </div>
-    """, unsafe_allow_html=True
-)
-
-# Bouton pour télécharger les données sous forme de CSV avec style
-st.markdown(
-    """
-    <style>
-    .stDownloadButton button {
-        background-color: #6C63FF;
-        color: white;
-        border-radius: 5px;
-        padding: 10px 20px;
-        font-size: 16px;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
-
-st.download_button(label="Download Performance Data", 
-                   data=df_performance.to_csv(index=False), 
-                   file_name='career_center_performance.csv',
-                   mime='text/csv')
-
-
-# Section 5: Analyse des tendances du marché avec comparaison intersectorielle
-st.markdown("<h2 class='section-title'>Market Trends Analysis</h2>", unsafe_allow_html=True)
-
-# Générer des données fictives pour les entreprises qui recrutent
-companies = ["Company A", "Company B", "Company C", "Company D", "Company E"]
-recruitment_numbers = np.random.randint(10, 50, size=len(companies))
-
-df_market_trends = pd.DataFrame({
-    "Company": companies,
-    "Number of Recruits": recruitment_numbers
-})
-
-# Générer des données fictives pour la comparaison intersectorielle
-df_comparison = pd.DataFrame({
-    "Year": years,
-    "Tech": np.random.randint(50, 90, size=len(years)),
-    "Finance": np.random.randint(50, 85, size=len(years)),
-    "Healthcare": np.random.randint(45, 80, size=len(years)),
-    "Education": np.random.randint(40, 75, size=(len(years))),
-    "Consulting": np.random.randint(50, 88, size=(len(years))),
-    "Engineering": np.random.randint(55, 92, size=(len(years)))
-})
-
-# Création des graphiques avec Plotly
-fig4 = px.bar(
-    df_market_trends, 
-    x='Company', 
-    y='Number of Recruits', 
-    text_auto=True, 
-    title="Top Recruiting Companies",
-    color='Company',
-    color_discrete_sequence=colors
-)
-fig4.update_layout(
-    xaxis_title="Company", 
-    yaxis_title="Number of Recruits",
-    plot_bgcolor='#F7F7F7',
-    showlegend=False  # Cacher la légende pour ce graphique
-)
-
-fig5 = go.Figure()
-for i, sector in enumerate(sectors):
-    fig5.add_trace(go.Scatter(
-        x=df_comparison["Year"], 
-        y=df_comparison[sector], 
-        mode='lines+markers', 
-        name=sector, 
-        line=dict(color=colors[i % len(colors)])
+    # Ajout d'un graphique Scatterpolar pour la satisfaction moyenne par catégorie
+    fig4 = go.Figure()
+
+    fig4.add_trace(go.Scatterpolar(
+        r=df_categories['Satisfaction Score (%)'],
+        theta=df_categories['Category'],
+        fill='toself',
+        name='Category Satisfaction',
+        marker=dict(color='#6C63FF')
     ))
 
-fig5.update_layout(
-    title="Employment Trends by Sector", 
-    xaxis_title="Year", 
-    yaxis_title="Placement Rate (%)",
-    plot_bgcolor='#F7F7F7'
-)
+    fig4.update_layout(
+        polar=dict(
+            radialaxis=dict(visible=True, range=[0, 100]),
+        ),
+        showlegend=False,
+        title="Category Satisfaction",
+        margin=dict(l=40, r=40, t=40, b=40),
+    )
+    return figures.compact(fig3), figures.compact(fig4), df_performance, budget_used
 
-# Affichage côte à côte des deux graphiques
-col1, col2 = st.columns(2)
 
-with col1:
-    st.plotly_chart(fig4, use_container_width=True)
+def build_market_trends(filters):
+    # Palette de couleurs améliorée (celle du modèle partagé)
+    colors = figures.COLORS
 
-with col2:
-    st.plotly_chart(fig5, use_container_width=True)
+    # Nombre de recrutements par entreprise
+    df_market_trends = data.load_market_trends(filters=filters)
 
-# Paramètres généraux
-years = np.arange(2015, 2025)
-stakeholders = ["Students", "Employers", "University"]
-colors = ["#636EFA", "#EF553B", "#00CC96"]
+    # Comparaison intersectorielle des taux de placement
+    df_comparison = data.load_comparison(filters=filters)
 
-# Section 6: Suivi du Score de Satisfaction des Parties Prenantes
-st.markdown("<h2 class='section-title'>Stakeholder Satisfaction and Sentiment Analysis</h2>", unsafe_allow_html=True)
+    # Création des graphiques avec Plotly
+    fig4 = px.bar(
+        df_market_trends,
+        x='Company',
+        y='Number of Recruits',
+        text_auto=True,
+        title="Top Recruiting Companies",
+        color='Company',
+        color_discrete_sequence=colors
+    )
+    fig4.update_layout(
+        xaxis_title="Company",
+        yaxis_title="Number of Recruits",
+        showlegend=False  # Cacher la légende pour ce graphique
+    )
 
-# Diviser l'espace en deux colonnes
-col1, col2 = st.columns(2)
+    fig5 = go.Figure()
+    for i, sector in enumerate(df_comparison.columns.drop("Year")):
+        # Séries longues réduites (LTTB) au nombre de points affichables
+        fig5.add_trace(line_trace(
+            df_comparison["Year"],
+            df_comparison[sector],
+            mode='lines+markers',
+            name=sector,
+            line=dict(color=colors[i % len(colors)])
+        ))
+
+    # Prévision pour l'année suivante
+    add_forecast(fig5, df_comparison.set_index("Year"), colors)
+
+    fig5.update_layout(
+        title="Employment Trends by Sector",
+        xaxis_title="Year",
+        yaxis_title="Placement Rate (%)"
+    )
+    return figures.compact(fig4), figures.compact(fig5)
 
-# Colonne 1 : Suivi du Score de Satisfaction des Parties Prenantes
-with col1:
-    st.subheader("Satisfaction Score Over Time")
 
-    # Données fictives pour les scores de satisfaction au fil du temps
-    df_satisfaction_time = pd.DataFrame({
-        "Year": years,
-        "Students": np.random.randint(75, 95, size=len(years)),
-        "Employers": np.random.randint(60, 90, size=len(years)),
-        "University": np.random.randint(65, 85, size=len(years)),
-    })
+def build_satisfaction():
+    # Paramètres généraux
+    colors = ["#636EFA", "#EF553B", "#00CC96"]
+
+    # Scores de satisfaction au fil du temps
+    df_satisfaction_time = data.load_satisfaction_time()
 
     # Graphique de ligne pour suivre l'évolution des scores de satisfaction
     fig6 = go.Figure()
     for i, stakeholder in enumerate(stakeholders):
-        fig6.add_trace(go.Scatter(x=df_satisfaction_time["Year"], y=df_satisfaction_time[stakeholder],
+        fig6.add_trace(line_trace(df_satisfaction_time["Year"], df_satisfaction_time[stakeholder],
                                   mode='lines+markers', name=stakeholder,
                                   line=dict(color=colors[i % len(colors)])))
 
-    fig6.update_layout(title="Stakeholder Satisfaction Over Time", xaxis_title="Year", yaxis_title="Satisfaction Score (%)",
-                       plot_bgcolor='#F7F7F7')
-    st.plotly_chart(fig6, use_container_width=True)
-
-    # Calculer la moyenne de satisfaction pour chaque stakeholder
-    avg_satisfaction_students = df_satisfaction_time["Students"].mean()
-    avg_satisfaction_employers = df_satisfaction_time["Employers"].mean()
-    avg_satisfaction_faculty = df_satisfaction_time["University"].mean()
-
-    # Calculer la moyenne globale en prenant en compte chaque stakeholder
-    avg_satisfaction = (avg_satisfaction_students + avg_satisfaction_employers + avg_satisfaction_faculty) / 3
-
-# Colonne 2 : Analyse du Sentiment des Commentaires des Parties Prenantes
-with col2:
-    st.subheader("Sentiment Analysis of Stakeholder Feedback")
-
-    # Exemples de commentaires fictifs
-    comments = [
-        # Commentaires positifs (80%)
-        "The career services are amazing!",
-        "The mentorship program is fantastic!",
-        "I'm very satisfied with the opportunities provided.",
-        "Great support from the University.",
-        "Excellent career coaching and resources.",
-        "The job fair was very well organized!",
-        "I found the career advice to be extremely helpful.",
-        "The university's network has been invaluable for my job search.",
-        "Amazing internship opportunities available!",
-        "The career center staff are very supportive.",
-        "I received great feedback during the mock interviews.",
-        "The resume review service was top-notch.",
-        "Very pleased with the company connections the university has.",
-        "The workshops offered have been incredibly useful.",
-        "I appreciate the personalized career guidance.",
-        "Great experience with the job placement services.",
-        "The career fairs have a lot of great companies attending.",
-        "The alumni network is very active and helpful.",
-        "Really enjoyed the career development seminars.",
-        "The university has great resources for career planning.",
-
-        # Commentaires neutres (15%)
-        "The career services are decent.",
-        "The job placement rate is okay.",
-        "Career counseling sessions are average.",
-        "The job fair was good, but could be better.",
-        "The recruitment process is fine.",
-        "I feel the career services meet my basic needs.",
-        "The career center is functional.",
-        "The internship options are alright.",
-        "It was an average experience overall.",
-        "The career guidance was satisfactory.",
-        
-        # Commentaires négatifs (5%)
-        "I wish the job placement was better.",
-        "The recruitment process could be improved.",
-        "Not satisfied with the career services offered.",
-        "The career fair lacked diversity in companies.",
-        "The job search support is lacking."
-    ]
+    fig6.update_layout(title="Stakeholder Satisfaction Over Time", xaxis_title="Year", yaxis_title="Satisfaction Score (%)")
+    return figures.compact(fig6)
 
-    # Analyse du sentiment
-    sentiments = [TextBlob(comment).sentiment.polarity for comment in comments]
-    df_sentiment = pd.DataFrame({"Comment": comments, "Sentiment Score": sentiments})
 
-    # Catégoriser les commentaires selon la polarité
-    df_sentiment["Sentiment"] = df_sentiment["Sentiment Score"].apply(lambda x: 'Positive' if x > 0.1 else ('Neutral' if x >= -0.1 else 'Negative'))
+def build_sentiment():
+    # Analyse du sentiment des commentaires des parties prenantes (scores mis en
+    # cache, commentaires catégorisés selon la polarité)
+    feedback_index = data.load_feedback_index()
 
-    # Compter le nombre de commentaires dans chaque catégorie
-    sentiment_counts = df_sentiment["Sentiment"].value_counts().reindex(["Positive", "Neutral", "Negative"], fill_value=0)
+    # Nombre de commentaires dans chaque catégorie (masques précalculés de l'index) ;
+    # les commentaires eux-mêmes sont consultés dans l'explorateur paginé
+    sentiment_counts = feedback_index.counts()
 
     # Créer un graphique en barres pour montrer le nombre de commentaires par polarité
     fig_sentiment = go.Figure(data=[
         go.Bar(
             x=sentiment_counts.index,
             y=sentiment_counts.values,
-            text=[
-                "<br>".join(df_sentiment[df_sentiment["Sentiment"] == sentiment]["Comment"].values[:2])
-                for sentiment in sentiment_counts.index
-            ],
+            text=sentiment_counts.values,
             textposition='auto',
             marker_color=['green', 'gray', 'red']
         )
     ])
-    
+
     fig_sentiment.update_layout(
         title="Sentiment Analysis of Stakeholder Comments",
         xaxis_title="Sentiment",
-        yaxis_title="Number of Comments",
-        plot_bgcolor='#F7F7F7'
+        yaxis_title="Number of Comments"
+    )
+    return figures.compact(fig_sentiment)
+
+
+def export_data(key, tables):
+    """Export des données d'une section ; chaque fichier n'est généré qu'au clic.
+
+    `tables` associe un nom de fichier à une fonction renvoyant les blocs de
+    lignes à exporter (voir exports.chunks).
+    """
+    with st.expander("Export data"):
+        fmt = st.radio("Format", list(exports.FORMATS), horizontal=True, key=f"export_format_{key}")
+        for name, make_blocks in tables.items():
+            st.download_button(label=f"Download {name}",
+                               data=exports.deferred(make_blocks, fmt),
+                               file_name=exports.file_name(name, fmt),
+                               mime=exports.FORMATS[fmt][1],
+                               on_click="ignore",
+                               key=f"export_{key}_{name}")
+
+
+def reset_feedback_page():
+    st.session_state["feedback_page"] = 1
+
+
+def feedback_explorer():
+    """Explorateur des commentaires : recherche par mots-clés, filtre par sentiment et pagination.
+
+    La recherche et le filtrage passent par l'index inversé partagé
+    (feedback.py) ; seule la page affichée est envoyée au navigateur.
+    Renvoie le masque des commentaires sélectionnés.
+    """
+    feedback_index = data.load_feedback_index()
+
+    col1, col2 = st.columns([2, 1])
+    query = col1.text_input("Search comments", key="feedback_query", on_change=reset_feedback_page)
+    sentiments = col2.multiselect("Sentiment", SENTIMENT_LABELS, default=SENTIMENT_LABELS,
+                                  key="feedback_sentiments", on_change=reset_feedback_page)
+
+    with profiling.timed("feedback search"):
+        mask = feedback_index.mask(query, sentiments)
+    matches = int(np.count_nonzero(mask))
+    pages = max(1, -(-matches // PAGE_SIZE))
+    # Page courante ramenée dans les bornes si le nombre de résultats a diminué
+    if st.session_state.get("feedback_page", 1) > pages:
+        st.session_state["feedback_page"] = pages
+    number = st.number_input("Page", min_value=1, max_value=pages, step=1, key="feedback_page")
+
+    st.dataframe(feedback_index.page(mask, number), hide_index=True)
+    if matches:
+        first, last = (number - 1) * PAGE_SIZE + 1, min(number * PAGE_SIZE, matches)
+        st.caption(f"Showing {first:,}-{last:,} of {matches:,} comments (page {number} of {pages})")
+    else:
+        st.caption("No matching comments")
+    return mask
+
+
+def placement_records(filters):
+    """Blocs des enregistrements de placement filtrés (export au niveau de l'étudiant)."""
+    return exports.chunks(data.load_placements(), data.load_bitmap_index().mask(filters))
+
+
+def filter_bar():
+    """Barre de filtres globale, appliquée à tous les graphiques de placement.
+
+    Renvoie {dimension: valeurs sélectionnées} ; une dimension sans sélection
+    n'est pas filtrée. Les filtres sont résolus par les masques précalculés
+    du cube et de l'index bitmap des enregistrements (bitmap.py).
+    """
+    options = data.load_filter_options()
+    filters = {}
+    with st.expander("Filters", expanded=True):
+        cols = st.columns(len(data.FILTER_DIMENSIONS))
+        for col, (dimension, label) in zip(cols, data.FILTER_DIMENSIONS.items()):
+            selected = col.multiselect(label, options[dimension], placeholder="All", key=f"filter_{dimension}")
+            if selected:
+                # Ordre canonique : une même sélection partage les mêmes entrées en cache
+                filters[dimension] = tuple(value for value in options[dimension] if value in selected)
+        students, placed, rate = data.load_cube().total(**filters)
+        if not students:
+            st.warning("No students match the selected filters.")
+            st.stop()
+        if filters:
+            st.caption(f"{students:,} students match the filters ({placed:,} placed, {rate}%)")
+    return filters
+
+
+# Chaque section est un fragment Streamlit : une interaction avec un widget
+# d'une section ne réexécute (et ne renvoie au navigateur) que cette section.
+
+@st.fragment
+@profiling.timed("Overview")
+def overview_section():
+    """Section 1 : taux de placement par secteur, nuage de mots et statistiques clés."""
+    # Section 1: Vue d'ensemble avec filtres dynamiques
+    st.markdown("<h2 class='section-title'>Overview of Placement Rates</h2>", unsafe_allow_html=True)
+
+    # Taux de placement par secteur des étudiants retenus par la barre de filtres
+    fig1, df_filtered, overall_rate = shared_artifact("sector_pie", build_sector_pie, filters)
+
+    # Afficher côte à côte le pie chart et le word cloud
+    col1, col2 = st.columns(2)
+
+    with col1:
+        profiling.plotly_chart(fig1)
+
+    with col2:
+        # Titre distinct pour le word cloud
+        st.subheader("Word Cloud of Job Titles")
+        # Le pie chart est déjà affiché pendant le premier rendu du nuage de mots
+        with st.spinner("Rendering word cloud..."):
+            wordcloud_image = shared_artifact("wordcloud", build_wordcloud, filters)
+        # Afficher le nuage de mots dans Streamlit
+        st.image(wordcloud_image, width="stretch")
+
+    # Statistiques clés avec mise en valeur
+    st.subheader("Key Statistics")
+
+    # Créer une palette de couleurs harmonisée pour les statistiques
+    background_colors = ["#6C63FF", "#FF6347", "#FFD700"]
+    text_color = "white"
+
+    # Liste des statistiques clés
+    metrics = [
+        {
+            "title": "Overall Placement Rate",
+            "value": f"{overall_rate:.1f}%",
+            "background_color": background_colors[0],
+            "icon": "fa-line-chart"
+        },
+        {
+            "title": "Highest Placement Sector",
+            "value": f"{df_filtered['Sector'].iloc[np.argmax(df_filtered['Placement Rate (%)'])]} ({np.max(df_filtered['Placement Rate (%)'])}%)",
+            "background_color": background_colors[1],
+            "icon": "fa-arrow-up"
+        },
+        {
+            "title": "Lowest Placement Sector",
+            "value": f"{df_filtered['Sector'].iloc[np.argmin(df_filtered['Placement Rate (%)'])]} ({np.min(df_filtered['Placement Rate (%)'])}%)",
+            "background_color": background_colors[2],
+            "icon": "fa-arrow-down"
+        }
+    ]
+
+    # Afficher les statistiques en utilisant les colonnes de Streamlit avec un style réactif
+    cols = st.columns(len(metrics))
+
+    for col, metric in zip(cols, metrics):
+        col.markdown(
+            f"""
+            <div style='background-color: {metric['background_color']}; padding: 20px; border-radius: 10px; text-align: center;'>
+                <h3 style='color: {text_color}; margin-bottom: 10px;'>{metric['title']}</h3>
+                <i style='color: {text_color}; font-size: 30px; margin-bottom: 10px;' class="fa {metric['icon']}"></i>
+                <p style='font-size: 35px; color: {text_color}; font-weight: bold; margin: 0;'>{metric['value']}</p>
+            </div>
+            """, unsafe_allow_html=True
+        )
+
+    export_data("overview", {
+        "Placement Records": lambda: placement_records(filters),
+        "Placement Rates by Sector": lambda: exports.chunks(df_filtered),
+    })
+
+
+@st.fragment
+@profiling.timed("Recruitment Map")
+def geo_section():
+    """Section 2 : carte mondiale des recrutements."""
+    fig = shared_artifact("geo", build_geo, filters)
+
+    # Afficher la carte dans Streamlit
+    st.markdown("<h2 class='section-title'>Global Recruitment Heatmap</h2>", unsafe_allow_html=True)
+    profiling.plotly_chart(fig)
+
+    export_data("geo", {"Recruits by Area": lambda: exports.chunks(data.load_geo_layer(filters=filters).frame)})
+
+
+@st.fragment
+@profiling.timed("Detailed Analysis")
+def detailed_analysis_section():
+    """Section 3 : tendances par cohorte et par niveau d'études."""
+    # Section 3: Analyse détaillée avec prévisions
+    st.markdown("<h2 class='section-title'>Detailed Placement Analysis</h2>", unsafe_allow_html=True)
+
+    fig2, fig_degree = shared_artifact("detailed_analysis", build_detailed_analysis, filters)
+
+    # Afficher côte à côte les graphiques de la section 2
+    col1, col2 = st.columns(2)
+
+    with col1:
+        profiling.plotly_chart(fig2)
+
+    with col2:
+        profiling.plotly_chart(fig_degree)
+
+    export_data("detailed_analysis", {
+        "Cohort Placement Rates": lambda: exports.chunks(data.load_cohorts(filters=filters)),
+        "Degree Placement Rates": lambda: exports.chunks(data.load_degree(filters=filters)),
+    })
+
+
+@st.fragment
+@profiling.timed("Career Center Performance")
+def performance_section():
+    """Section 4 : performance du Career Center."""
+    # Section 4: Performance du Career Center avec rapports téléchargeables
+    st.markdown("<h2 class='section-title'>Career Center Performance</h2>", unsafe_allow_html=True)
+
+    fig3, fig4, df_performance, budget_used = shared_artifact("performance", build_performance)
+
+    # Afficher les deux graphiques côte à côte
+    col1, col2 = st.columns(2)
+
+    with col1:
+        profiling.plotly_chart(fig3)
+
+    with col2:
+        profiling.plotly_chart(fig4)
+
+    # Affichage du budget utilisé avec amélioration esthétique
+    st.markdown(
+        f"""
+        <div style='background-color: #FFD700; padding: 10px; border-radius: 5px; text-align: center;'>
+            <h2 style='color: #000;'>Budget Utilized: {budget_used:.1f}% of Total</h2>
+        </div>
+        """, unsafe_allow_html=True
     )
 
-    st.plotly_chart(fig_sentiment, use_container_width=True)
+    # Boutons pour télécharger les données de la section
+    export_data("performance", {
+        "Career Center Performance": lambda: exports.chunks(df_performance),
+        "Category Satisfaction": lambda: exports.chunks(data.load_performance()[1]),
+    })
+
+
+@st.fragment
+@profiling.timed("Market Trends")
+def market_trends_section():
+    """Section 5 : tendances du marché et comparaison intersectorielle."""
+    # Section 5: Analyse des tendances du marché avec comparaison intersectorielle
+    st.markdown("<h2 class='section-title'>Market Trends Analysis</h2>", unsafe_allow_html=True)
+
+    fig4, fig5 = shared_artifact("market_trends", build_market_trends, filters)
+
+    # Affichage côte à côte des deux graphiques
+    col1, col2 = st.columns(2)
+
+    with col1:
+        profiling.plotly_chart(fig4)
+
+    with col2:
+        profiling.plotly_chart(fig5)
+
+    export_data("market_trends", {
+        "Top Recruiting Companies": lambda: exports.chunks(data.load_market_trends(filters=filters)),
+        "Employment Trends by Sector": lambda: exports.chunks(data.load_comparison(filters=filters)),
+    })
+
+
+@st.fragment
+@profiling.timed("Satisfaction & Sentiment")
+def satisfaction_section():
+    """Section 6 : satisfaction et analyse du sentiment des parties prenantes."""
+    # Section 6: Suivi du Score de Satisfaction des Parties Prenantes
+    st.markdown("<h2 class='section-title'>Stakeholder Satisfaction and Sentiment Analysis</h2>", unsafe_allow_html=True)
+
+    # Diviser l'espace en deux colonnes
+    col1, col2 = st.columns(2)
+
+    # Colonne 1 : Suivi du Score de Satisfaction des Parties Prenantes
+    with col1:
+        st.subheader("Satisfaction Score Over Time")
+        profiling.plotly_chart(shared_artifact("satisfaction", build_satisfaction))
+
+    # Colonne 2 : Analyse du Sentiment des Commentaires des Parties Prenantes
+    with col2:
+        st.subheader("Sentiment Analysis of Stakeholder Feedback")
+        profiling.plotly_chart(shared_artifact("sentiment", build_sentiment))
+
+    # Explorateur des commentaires (recherche, filtre et pagination côté serveur)
+    st.subheader("Feedback Explorer")
+    feedback_mask = feedback_explorer()
+
+    export_data("satisfaction", {
+        "Satisfaction Over Time": lambda: exports.chunks(data.load_satisfaction_time()),
+        # Commentaires correspondant à la recherche et au filtre de l'explorateur
+        "Stakeholder Comments": lambda: exports.chunks(data.load_feedback_index().frame, feedback_mask),
+    })
+
+
+# Filtres globaux de cette exécution : toute modification réexécute la page entière
+filters = filter_bar()
+
+SECTIONS = {
+    "Overview": overview_section,
+    "Recruitment Map": geo_section,
+    "Detailed Analysis": detailed_analysis_section,
+    "Career Center Performance": performance_section,
+    "Market Trends": market_trends_section,
+    "Satisfaction & Sentiment": satisfaction_section,
+}
+
+# Graphe de dépendances des artefacts et des jeux de données partagés dont ils
+# dépendent : les calculs indépendants sont exécutés en parallèle
+TASKS = [
+    Task("placements", data.load_placements, cached=data.load_placements.cached),
+    Task("cube", data.load_cube, ("placements",), cached=data.load_cube.cached),
+    Task("job_titles", lambda: data.load_job_title_frequencies(filters=filters), ("placements",),
+         cached=lambda: data.load_job_title_frequencies.cached(filters=filters)),
+    artifact_task("sector_pie", build_sector_pie, ("cube",), (filters,)),
+    artifact_task("wordcloud", build_wordcloud, ("job_titles",), (filters,)),
+    artifact_task("geo", build_geo, ("cube",), (filters,)),
+    artifact_task("detailed_analysis", build_detailed_analysis, ("cube",), (filters,)),
+    artifact_task("performance", build_performance),
+    artifact_task("market_trends", build_market_trends, ("cube",), (filters,)),
+    artifact_task("satisfaction", build_satisfaction),
+    Task("feedback_index", data.load_feedback_index, cached=data.load_feedback_index.cached),
+    artifact_task("sentiment", build_sentiment, ("feedback_index",)),
+]
+
+# Artefacts précalculés de chaque section
+SECTION_ARTIFACTS = {
+    "Overview": ("sector_pie", "wordcloud"),
+    "Recruitment Map": ("geo",),
+    "Detailed Analysis": ("detailed_analysis",),
+    "Career Center Performance": ("performance",),
+    "Market Trends": ("market_trends",),
+    "Satisfaction & Sentiment": ("satisfaction", "sentiment"),
+}
+
+scheduler = get_scheduler()
+
+if LAZY_SECTIONS:
+    # Seul l'onglet ouvert est exécuté : changer d'onglet relance le script
+    tabs = st.tabs(list(SECTIONS), key="section", on_change="rerun")
+    for tab, (name, section) in zip(tabs, SECTIONS.items()):
+        if tab.open:
+            # Artefacts de la section lancés en parallèle ; la section attend
+            # chacun d'eux au moment de l'afficher
+            scheduler.run(TASKS, SECTION_ARTIFACTS[name])
+            with tab:
+                section()
+else:
+    # Tous les artefacts sont lancés en parallèle ; chaque section est affichée
+    # à sa place dans la page dès que ses artefacts sont prêts
+    containers = {name: st.container() for name in SECTIONS}
+    futures = scheduler.run(TASKS, [artifact for names in SECTION_ARTIFACTS.values() for artifact in names])
+    pending = list(SECTIONS)
+    while pending:
+        ready = [name for name in pending if all(futures[a].done() for a in SECTION_ARTIFACTS[name])]
+        if not ready:
+            wait([futures[a] for name in pending for a in SECTION_ARTIFACTS[name] if not futures[a].done()],
+                 return_when=FIRST_COMPLETED)
+        for name in ready:
+            with containers[name]:
+                SECTIONS[name]()
+            pending.remove(name)
+
+# Rapport de démarrage (imports différés et sections), figé à la première exécution
+profiling.record_startup()
+
+# Panneau de profilage (DASHBOARD_PROFILE=1 ou ?profile=1 dans l'URL)
+if profiling.enabled():
+    profiling.render_panel()
+    profiling.log_run()
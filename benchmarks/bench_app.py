@@ -0,0 +1,185 @@
+"""Benchmark headless du tableau de bord (streamlit.testing.v1.AppTest).
+
+Pour chaque taille de données, un processus neuf exécute les scénarios :
+démarrage à froid, rerun à chaud et changement du filtre de secteurs. On
+mesure la durée totale, la durée de chaque section et le pic de mémoire (RSS).
+Chaque taille est mesurée REPEATS fois et l'on retient les médianes ; seules
+la durée totale et la mémoire font échouer la comparaison, les durées par
+section sont signalées à titre indicatif.
+
+    python benchmarks/bench_app.py                      # compare à la référence
+    python benchmarks/bench_app.py --update-baseline    # enregistre la référence
+    python benchmarks/bench_app.py --update-baseline --scenarios filter_change
+                                                        # ne réenregistre que ce scénario
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "app.py"
+RESULTS = Path(__file__).resolve().parent / "results.json"
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+DEFAULT_SIZES = [6_000, 100_000, 1_000_000]
+
+# Nombre d'exécutions par taille (processus neufs), résumées par leur médiane
+REPEATS = 3
+
+# Une mesure est une régression si elle dépasse la référence de plus de
+# TOLERANCE (relatif) et de plus de MIN_DELTA secondes (absolu, contre le bruit)
+TOLERANCE = 0.5
+MIN_DELTA = 0.05
+RSS_TOLERANCE = 0.25
+
+
+def _peak_rss_mb():
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def _scenario(at, action):
+    start = time.perf_counter()
+    action()
+    wall = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"App raised: {at.exception[0].message}")
+    return {
+        "wall_s": round(wall, 4),
+        "sections_s": {name: round(t, 4) for name, t in at.session_state["_timings"].items()},
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def run_worker(size):
+    """Exécute les scénarios dans le processus courant et renvoie les mesures."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=600)
+    results = {"cold_start": _scenario(at, at.run)}
+    results["warm_rerun"] = _scenario(at, at.run)
+
+    sectors = at.multiselect(key="filter_sector").options
+    results["filter_change"] = _scenario(
+        at, lambda: at.multiselect(key="filter_sector").set_value(sectors[: max(1, len(sectors) // 2)]).run())
+    return results
+
+
+def run_size(size, lazy):
+    # Caches disque isolés : un démarrage à froid ne doit rien réutiliser
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = {**os.environ,
+               "DEMO_SIZE": str(size),
+               "LAZY_SECTIONS": "1" if lazy else "0",
+               "WORDCLOUD_CACHE_DIR": os.path.join(cache_dir, "wordcloud"),
+               "SENTIMENT_CACHE_PATH": os.path.join(cache_dir, "sentiment.sqlite")}
+        env.pop("PLACEMENTS_SOURCE", None)
+        output = subprocess.run([sys.executable, __file__, "--worker", str(size)],
+                                env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median_runs(runs):
+    """Médiane, scénario par scénario, de plusieurs exécutions d'une même taille."""
+    def median(values):
+        return round(statistics.median(values), 4)
+
+    summary = {}
+    for scenario in runs[0]:
+        measures = [run[scenario] for run in runs]
+        sections = dict.fromkeys(name for measure in measures for name in measure["sections_s"])
+        summary[scenario] = {
+            "wall_s": median([m["wall_s"] for m in measures]),
+            "sections_s": {name: median([m["sections_s"][name] for m in measures if name in m["sections_s"]])
+                           for name in sections},
+            "peak_rss_mb": round(statistics.median(m["peak_rss_mb"] for m in measures), 1),
+        }
+    return summary
+
+
+def _slower(value, ref):
+    return value > ref * (1 + TOLERANCE) and value - ref > MIN_DELTA
+
+
+def compare(results, baseline):
+    """Régressions par rapport à la référence (durée totale et mémoire), et sections ralenties.
+
+    Renvoie deux listes : les régressions, qui font échouer la comparaison, et
+    les durées par section en hausse, signalées sans la faire échouer.
+    """
+    regressions, slower_sections = [], []
+    for size, scenarios in results.items():
+        for scenario, current in scenarios.items():
+            reference = baseline.get(size, {}).get(scenario)
+            if reference is None:
+                continue
+            if _slower(current["wall_s"], reference["wall_s"]):
+                regressions.append(f"{size}/{scenario}/wall_s: {current['wall_s']:.3f}s "
+                                   f"(baseline {reference['wall_s']:.3f}s)")
+            rss, ref_rss = current["peak_rss_mb"], reference["peak_rss_mb"]
+            if rss > ref_rss * (1 + RSS_TOLERANCE):
+                regressions.append(f"{size}/{scenario}/peak_rss_mb: {rss:.0f} MiB (baseline {ref_rss:.0f} MiB)")
+            for name, value in current["sections_s"].items():
+                ref = reference["sections_s"].get(name)
+                if ref is not None and _slower(value, ref):
+                    slower_sections.append(f"{size}/{scenario}/sections_s.{name}: {value:.3f}s "
+                                           f"(baseline {ref:.3f}s)")
+    return regressions, slower_sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda s: [int(v) for v in s.split(",")], default=DEFAULT_SIZES,
+                        help="comma-separated numbers of placement records")
+    parser.add_argument("--lazy", action="store_true", help="benchmark the tabbed lazy-section mode")
+    parser.add_argument("--repeat", type=int, default=REPEATS, help="runs per size, summarized by their median")
+    parser.add_argument("--output", type=Path, default=RESULTS)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--scenarios", type=lambda s: s.split(","),
+                        help="with --update-baseline, comma-separated scenarios to re-record (others are kept)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_worker(args.worker)))
+        return 0
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = median_runs([run_size(size, args.lazy) for _ in range(args.repeat)])
+        for scenario, measure in results[str(size)].items():
+            print(f"{size:>10,} {scenario:<14} {measure['wall_s']:8.3f}s  {measure['peak_rss_mb']:8.1f} MiB")
+
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.update_baseline:
+        # Scénarios non cités : leur référence est conservée telle quelle
+        baseline = json.loads(args.baseline.read_text()) if args.scenarios and args.baseline.exists() else {}
+        for size, scenarios in results.items():
+            for scenario, measure in scenarios.items():
+                if not args.scenarios or scenario in args.scenarios:
+                    baseline.setdefault(size, {})[scenario] = measure
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    regressions, slower_sections = compare(results, json.loads(args.baseline.read_text()))
+    for section in slower_sections:
+        print(f"slower section (not gated) {section}")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
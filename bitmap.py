@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+
+def value_masks(column):
+    """Masque booléen des lignes de chaque valeur observée de `column` ({valeur: masque})."""
+    codes, values = pd.factorize(column)
+    return {value: codes == i for i, value in enumerate(values)}
+
+
+def combine(masks, filters, empty):
+    """Combine les masques par valeur selon `filters` (dimension=valeurs).
+
+    Les valeurs d'une même dimension sont réunies (OU), les dimensions
+    croisées (ET). Renvoie None si aucun filtre n'est actif ; `empty` crée le
+    masque vide de départ de chaque dimension.
+    """
+    selected = None
+    for dimension, values in filters.items():
+        if values is None:
+            continue
+        if dimension not in masks:
+            raise KeyError(f"Unknown filter dimension: {dimension!r}")
+        condition = empty()
+        for value in values:
+            if value in masks[dimension]:
+                condition |= masks[dimension][value]
+        if selected is None:
+            selected = condition
+        else:
+            selected &= condition
+    return selected
+
+
+class BitmapIndex:
+    """Index bitmap des enregistrements de placement, construit une fois au chargement.
+
+    Chaque valeur de chaque dimension catégorielle a son bitmap (masque des
+    lignes, compressé à un bit par étudiant). Un filtre combiné se réduit à
+    quelques OU/ET sur ces bitmaps, sans parcourir les colonnes.
+    """
+
+    def __init__(self, records, dimensions):
+        self.size = len(records)
+        self.bitmaps = {
+            dimension: {value: np.packbits(mask) for value, mask in value_masks(records[dimension]).items()}
+            for dimension in dimensions if dimension in records
+        }
+        self.placed = np.packbits(records["placed"].to_numpy())
+
+    def mask(self, filters=None, placed=False):
+        """Masque booléen des enregistrements retenus par `filters` (et placés si `placed`)."""
+        bits = combine(self.bitmaps, filters or {}, lambda: np.zeros_like(self.placed))
+        if placed:
+            bits = self.placed if bits is None else bits & self.placed
+        if bits is None:
+            return np.ones(self.size, dtype=bool)
+        return np.unpackbits(bits, count=self.size).view(bool)
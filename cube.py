@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from bitmap import combine, value_masks
+
+# Dimensions du cube (colonnes catégorielles des enregistrements de placement)
+DIMENSIONS = ["sector", "year", "cohort", "degree_level", "country", "company"]
+
+
+class PlacementCube:
+    """Cube agrégé des placements : effectifs et nombre de placés par combinaison de dimensions.
+
+    Construit une seule fois à partir des enregistrements ; chaque graphique est
+    ensuite obtenu par agrégation (roll-up) du cube, dont la taille dépend du
+    nombre de combinaisons observées et non du nombre d'étudiants.
+    """
+
+    def __init__(self, cells, dimensions):
+        self.cells = cells
+        self.dimensions = dimensions
+        # Masque des cellules de chaque valeur de chaque dimension : un filtre
+        # se réduit à des OU/ET de masques précalculés
+        self.masks = {dimension: value_masks(cells[dimension]) for dimension in dimensions}
+
+    @classmethod
+    def from_records(cls, records, dimensions=DIMENSIONS):
+        dimensions = [d for d in dimensions if d in records]
+        grouped = records.groupby(dimensions, observed=True, sort=False)["placed"]
+        cells = pd.DataFrame({
+            "students": grouped.size().astype(np.int32),
+            "placed": grouped.sum().astype(np.int32),
+        }).reset_index()
+        return cls(cells, dimensions)
+
+    def merge(self, other):
+        """Cube combinant les cellules de deux cubes de mêmes dimensions (ajout de nouveaux enregistrements)."""
+        if other.dimensions != self.dimensions:
+            raise ValueError("Cannot merge cubes with different dimensions")
+        cells = pd.concat([self.cells, other.cells], ignore_index=True)
+        cells = cells.groupby(self.dimensions, observed=True, sort=False)[["students", "placed"]].sum()
+        cells = cells.astype(np.int32).reset_index()
+        for dimension in self.dimensions:
+            # Catégories différentes d'un cube à l'autre : le concat les a converties en object
+            if isinstance(self.cells[dimension].dtype, pd.CategoricalDtype):
+                cells[dimension] = cells[dimension].astype("category")
+        return PlacementCube(cells, self.dimensions)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def _select(self, filters):
+        mask = combine(self.masks, filters, lambda: np.zeros(len(self.cells), dtype=bool))
+        return self.cells if mask is None else self.cells[mask]
+
+    def rollup(self, by, **filters):
+        """Agrège le cube sur les dimensions `by`, après filtrage (dimension=valeurs).
+
+        Renvoie un DataFrame avec les colonnes `students`, `placed` et `rate` (en %).
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        cells = self._select(filters)
+        totals = cells.groupby(by, observed=True)[["students", "placed"]].sum()
+        totals["rate"] = (100 * totals["placed"] / totals["students"]).round(1)
+        return totals.reset_index()
+
+    def total(self, **filters):
+        """Effectif, nombre de placés et taux global pour un filtre donné."""
+        cells = self._select(filters)
+        students = int(cells["students"].sum())
+        placed = int(cells["placed"].sum())
+        rate = round(100 * placed / students, 1) if students else float("nan")
+        return students, placed, rate
@@ -0,0 +1,371 @@
+import os
+import zlib
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+import geo
+from bitmap import BitmapIndex
+from cube import PlacementCube
+from feedback import FeedbackIndex
+from ingest import load_placement_records
+from sentiment import get_engine
+from store import shared
+
+# Durée de vie (en secondes) des jeux de données mis en cache
+DATA_TTL = 3600
+
+# Source des enregistrements de placement : "demo" (données fictives générées
+# avec une graine fixe) ou chemin d'un fichier/répertoire CSV ou Parquet
+DEMO_SOURCE = "demo"
+DEFAULT_SOURCE = os.environ.get("PLACEMENTS_SOURCE", DEMO_SOURCE)
+DEFAULT_SEED = 42
+
+# Répertoire facultatif de commentaires des parties prenantes (.csv avec une
+# colonne « comment », ou .txt avec un commentaire par ligne)
+COMMENTS_SOURCE = os.environ.get("COMMENTS_SOURCE")
+
+PLACEMENT_SUFFIXES = (".parquet", ".csv", ".gz", ".bz2", ".zip", ".xz")
+COMMENT_SUFFIXES = (".csv", ".txt")
+
+# Nombre d'étudiants simulés pour la source de démonstration
+DEMO_SIZE = int(os.environ.get("DEMO_SIZE", 6000))
+
+SECTORS = ["Tech", "Finance", "Healthcare", "Education", "Consulting", "Engineering"]
+YEARS = [2020, 2021, 2022, 2023]
+COHORTS = ["Cohort A", "Cohort B", "Cohort C", "Cohort D"]
+STAKEHOLDERS = ["Students", "Employers", "University"]
+CATEGORIES = ["Communication", "Support", "Resources", "Events"]
+COMPANIES = ["Company A", "Company B", "Company C", "Company D", "Company E"]
+SATISFACTION_YEARS = list(range(2015, 2025))
+
+JOB_TITLES = ["Data Scientist", "Software Engineer", "Financial Analyst", "Healthcare Manager",
+              "Teacher", "Consultant", "Civil Engineer", "Mechanical Engineer",
+              "Project Manager", "Data Analyst", "Marketing Specialist", "Researcher"]
+
+# Métiers typiques de chaque secteur (données de démonstration)
+SECTOR_JOB_TITLES = {
+    "Tech": ["Data Scientist", "Software Engineer", "Data Analyst"],
+    "Finance": ["Financial Analyst", "Data Analyst"],
+    "Healthcare": ["Healthcare Manager", "Researcher"],
+    "Education": ["Teacher", "Researcher"],
+    "Consulting": ["Consultant", "Project Manager", "Marketing Specialist"],
+    "Engineering": ["Civil Engineer", "Mechanical Engineer", "Project Manager"],
+}
+
+DEGREE_LEVELS = ["Bachelor", "Master", "PhD"]
+
+# Codes ISO 3166-1 alpha-3 des pays de recrutement (pour la carte choroplèthe)
+COUNTRY_ISO3 = {
+    "Morocco": "MAR",
+    "France": "FRA",
+    "USA": "USA",
+    "Germany": "DEU",
+    "Canada": "CAN",
+    "Senegal": "SEN",
+    "Ivory Coast": "CIV",
+    "Nigeria": "NGA",
+    "Kenya": "KEN",
+    "Ghana": "GHA",
+    "Mali": "MLI",
+    "South Africa": "ZAF",
+    "Cameroon": "CMR",
+}
+
+# Fichier de polygones (régions) facultatif pour agréger les recrues géolocalisées
+REGIONS_PATH = os.environ.get("REGIONS_PATH")
+REGIONS_NAME_FIELD = os.environ.get("REGIONS_NAME_FIELD", "name")
+
+# Poids relatifs des pays de recrutement (données de démonstration)
+COUNTRY_WEIGHTS = [150, 80, 35, 50, 70, 90, 55, 120, 75, 65, 40, 85, 40]
+
+# Dimensions de la barre de filtres globale (appliquée à tous les graphiques de placement)
+FILTER_DIMENSIONS = {
+    "sector": "Sector",
+    "year": "Year",
+    "cohort": "Cohort",
+    "degree_level": "Degree",
+    "country": "Country",
+    "company": "Company",
+}
+
+
+def _rng(seed, name):
+    # Un générateur indépendant par jeu de données : le résultat d'un loader
+    # ne dépend plus de l'ordre dans lequel les autres sont appelés
+    return np.random.default_rng([seed, zlib.crc32(name.encode())])
+
+
+def data_files(directory, suffixes):
+    """Fichiers de données d'un répertoire (sous-répertoires compris), dans un ordre stable."""
+    return sorted(str(path) for path in Path(directory).rglob("*")
+                  if path.is_file() and path.suffix in suffixes)
+
+
+@shared(ttl=DATA_TTL, pinned=True)
+def load_placements(source=DEFAULT_SOURCE, seed=DEFAULT_SEED):
+    """Enregistrements de placement (une ligne par étudiant), au schéma compact d'ingest.py.
+
+    Comme tous les loaders, mis en cache dans le magasin partagé (store.py) :
+    le DataFrame est partagé en lecture seule entre les sessions au lieu
+    d'être copié à chaque accès.
+    """
+    if source == DEMO_SOURCE:
+        # Import local : synthetic.py s'appuie sur les listes de ce module
+        from synthetic import generate_records
+
+        return generate_records(DEMO_SIZE, seed)
+    if os.path.isdir(source):
+        # Liste des fichiers figée avant la lecture : refresh.py n'ingère
+        # ensuite que les fichiers arrivés depuis
+        files = data_files(source, PLACEMENT_SUFFIXES)
+        records, stats = load_placement_records(files)
+        loaded_files[source] = set(files)
+    else:
+        records, stats = load_placement_records(source)
+    ingest_stats[source] = stats
+    return records
+
+
+# Statistiques de la dernière ingestion, par source
+ingest_stats = {}
+
+# Fichiers déjà ingérés, par répertoire source
+loaded_files = {}
+
+
+@shared(ttl=DATA_TTL, pinned=True)
+def load_cube(source=DEFAULT_SOURCE, seed=DEFAULT_SEED):
+    """Cube agrégé des placements, matérialisé une fois au chargement des enregistrements."""
+    return PlacementCube.from_records(load_placements(source, seed))
+
+
+def placement_rates(cube, by, labels, **filters):
+    """Taux de placement par groupe, avec les libellés de colonnes des graphiques."""
+    by = [by] if isinstance(by, str) else list(by)
+    rates = cube.rollup(by, **filters)[[*by, "rate"]]
+    return rates.rename(columns={**labels, "rate": "Placement Rate (%)"})
+
+
+def recruits(cube, by, label, **filters):
+    """Nombre d'étudiants placés par groupe."""
+    placed = cube.rollup(by, **filters)
+    return pd.DataFrame({label: placed[by].astype(str), "Recruits": placed["placed"].to_numpy()})
+
+
+@shared(ttl=DATA_TTL, pinned=True)
+def load_bitmap_index(source=DEFAULT_SOURCE, seed=DEFAULT_SEED):
+    """Index bitmap des enregistrements (filtres au niveau de l'étudiant), voir bitmap.py."""
+    return BitmapIndex(load_placements(source, seed), FILTER_DIMENSIONS)
+
+
+@shared(ttl=DATA_TTL)
+def load_filter_options(source=DEFAULT_SOURCE, seed=DEFAULT_SEED):
+    """Valeurs proposées par la barre de filtres, pour chaque dimension."""
+    cells = load_cube(source, seed).cells
+    return {dimension: sorted(cells[dimension].unique().tolist()) for dimension in FILTER_DIMENSIONS}
+
+
+@shared(ttl=DATA_TTL)
+def load_overview(source=DEFAULT_SOURCE, seed=DEFAULT_SEED, filters=None):
+    return placement_rates(load_cube(source, seed), "sector", {"sector": "Sector"}, **(filters or {}))
+
+
+@shared(ttl=DATA_TTL)
+def load_job_title_frequencies(source=DEFAULT_SOURCE, seed=DEFAULT_SEED, filters=None):
+    records = load_placements(source, seed)
+    if not filters:
+        return job_title_counts(records)
+    return job_title_counts(records, load_bitmap_index(source, seed).mask(filters, placed=True))
+
+
+def job_title_counts(records, placed=None):
+    """Table de fréquences des métiers (nombre de placements par intitulé).
+
+    `placed` : masque des étudiants placés à compter (tous les placés par défaut).
+    """
+    if "job_title" not in records:
+        return {}
+    placed = records["placed"].to_numpy() if placed is None else placed
+    counts = records["job_title"][placed].value_counts()
+    return {str(title): int(count) for title, count in counts.items() if count > 0}
+
+
+@shared(ttl=DATA_TTL)
+def load_regions(path=REGIONS_PATH, name_field=REGIONS_NAME_FIELD):
+    return geo.load_regions(path, name_field)
+
+
+@shared(ttl=DATA_TTL)
+def load_geo_layer(source=DEFAULT_SOURCE, seed=DEFAULT_SEED, filters=None):
+    """Recrues agrégées par zone géographique, mises en cache par état des filtres.
+
+    Par région (si REGIONS_PATH est défini) ou par hexagone quand les
+    enregistrements sont géolocalisés (colonnes lat/lon), par pays sinon.
+    """
+    records = load_placements(source, seed)
+    if {"lat", "lon"} <= set(records.columns):
+        mask = load_bitmap_index(source, seed).mask(filters, placed=True)
+        located = records.loc[mask, ["lat", "lon"]].dropna()
+        if REGIONS_PATH:
+            return geo.region_layer(located["lat"], located["lon"], load_regions())
+        return geo.hex_layer(located["lat"], located["lon"])
+
+    by_country = load_cube(source, seed).rollup("country", **(filters or {}))
+    return geo.country_layer(by_country.set_index("country")["placed"], COUNTRY_ISO3)
+
+
+@shared(ttl=DATA_TTL)
+def load_cohorts(source=DEFAULT_SOURCE, seed=DEFAULT_SEED, filters=None):
+    return placement_rates(load_cube(source, seed), ["year", "cohort"],
+                           {"year": "Year", "cohort": "Cohort"}, **(filters or {}))
+
+
+@shared(ttl=DATA_TTL)
+def load_degree(source=DEFAULT_SOURCE, seed=DEFAULT_SEED, filters=None):
+    return placement_rates(load_cube(source, seed), "degree_level", {"degree_level": "Degree Level"},
+                           **(filters or {}))
+
+
+@shared(ttl=DATA_TTL)
+def load_market_trends(source=DEFAULT_SOURCE, seed=DEFAULT_SEED, filters=None):
+    df_market_trends = recruits(load_cube(source, seed), "company", "Company", **(filters or {}))
+    return df_market_trends.rename(columns={"Recruits": "Number of Recruits"})
+
+
+@shared(ttl=DATA_TTL)
+def load_comparison(source=DEFAULT_SOURCE, seed=DEFAULT_SEED, filters=None):
+    # Une colonne par secteur, une ligne par année
+    rates = load_cube(source, seed).rollup(["year", "sector"], **(filters or {}))
+    df_comparison = rates.pivot(index="year", columns="sector", values="rate")
+    df_comparison.columns = df_comparison.columns.astype(str)
+    return df_comparison.rename_axis(index="Year", columns=None).reset_index()
+
+
+# Jeux de données d'enquête (satisfaction, commentaires) : ils ne dépendent
+# pas de la source des enregistrements de placement
+
+
+@shared(ttl=DATA_TTL)
+def load_performance(seed=DEFAULT_SEED):
+    rng = _rng(seed, "performance")
+    df_performance = pd.DataFrame({
+        "Stakeholder": STAKEHOLDERS,
+        "Satisfaction Score (%)": rng.integers(70, 100, size=len(STAKEHOLDERS))
+    })
+    df_categories = pd.DataFrame({
+        "Category": CATEGORIES,
+        "Satisfaction Score (%)": rng.integers(70, 100, size=len(CATEGORIES))
+    })
+    budget_used = float(rng.uniform(50, 100))
+    return df_performance, df_categories, budget_used
+
+
+@shared(ttl=DATA_TTL)
+def load_satisfaction_time(seed=DEFAULT_SEED):
+    rng = _rng(seed, "satisfaction_time")
+    years = SATISFACTION_YEARS
+    return pd.DataFrame({
+        "Year": years,
+        "Students": rng.integers(75, 95, size=len(years)),
+        "Employers": rng.integers(60, 90, size=len(years)),
+        "University": rng.integers(65, 85, size=len(years)),
+    })
+
+
+def read_comments(files):
+    """Commentaires lus depuis des fichiers .csv (colonne « comment ») ou .txt (un par ligne)."""
+    comments = []
+    for file in files:
+        if file.endswith(".csv"):
+            column = pd.read_csv(file, usecols=["comment"], dtype=str, keep_default_na=False)["comment"]
+            comments.extend(comment for comment in column if comment.strip())
+        else:
+            with open(file, encoding="utf-8") as f:
+                comments.extend(line.strip() for line in f if line.strip())
+    return comments
+
+
+@shared(ttl=DATA_TTL)
+def load_comments(seed=DEFAULT_SEED, source=COMMENTS_SOURCE):
+    """Commentaires des parties prenantes (Series catégorielle : un texte répété n'est stocké qu'une fois).
+
+    Lus dans le répertoire `source` s'il est défini, sinon dans la colonne
+    `comment` des enregistrements de placement si elle existe ; à défaut, un
+    jeu de commentaires de démonstration.
+    """
+    if source is not None:
+        files = data_files(source, COMMENT_SUFFIXES)
+        loaded_files[source] = set(files)
+        return pd.Series(read_comments(files), dtype="category")
+    records = load_placements(DEFAULT_SOURCE, seed)
+    if "comment" in records:
+        # Colonne déjà catégorielle : ni liste de chaînes, ni nouvelle factorisation
+        return records["comment"].dropna().reset_index(drop=True)
+    return pd.Series([
+        # Commentaires positifs (80%)
+        "The career services are amazing!",
+        "The mentorship program is fantastic!",
+        "I'm very satisfied with the opportunities provided.",
+        "Great support from the University.",
+        "Excellent career coaching and resources.",
+        "The job fair was very well organized!",
+        "I found the career advice to be extremely helpful.",
+        "The university's network has been invaluable for my job search.",
+        "Amazing internship opportunities available!",
+        "The career center staff are very supportive.",
+        "I received great feedback during the mock interviews.",
+        "The resume review service was top-notch.",
+        "Very pleased with the company connections the university has.",
+        "The workshops offered have been incredibly useful.",
+        "I appreciate the personalized career guidance.",
+        "Great experience with the job placement services.",
+        "The career fairs have a lot of great companies attending.",
+        "The alumni network is very active and helpful.",
+        "Really enjoyed the career development seminars.",
+        "The university has great resources for career planning.",
+
+        # Commentaires neutres (15%)
+        "The career services are decent.",
+        "The job placement rate is okay.",
+        "Career counseling sessions are average.",
+        "The job fair was good, but could be better.",
+        "The recruitment process is fine.",
+        "I feel the career services meet my basic needs.",
+        "The career center is functional.",
+        "The internship options are alright.",
+        "It was an average experience overall.",
+        "The career guidance was satisfactory.",
+
+        # Commentaires négatifs (5%)
+        "I wish the job placement was better.",
+        "The recruitment process could be improved.",
+        "Not satisfied with the career services offered.",
+        "The career fair lacked diversity in companies.",
+        "The job search support is lacking."
+    ], dtype="category")
+
+
+@shared(ttl=DATA_TTL)
+def load_sentiment(seed=DEFAULT_SEED, source=COMMENTS_SOURCE):
+    """Commentaires scorés (polarité et catégorie de sentiment), voir sentiment.py."""
+    return get_engine().score(load_comments(seed, source))
+
+
+@shared(ttl=DATA_TTL)
+def load_feedback_index(seed=DEFAULT_SEED, source=COMMENTS_SOURCE):
+    """Index de recherche des commentaires scorés, pour l'explorateur paginé (voir feedback.py)."""
+    return FeedbackIndex(load_sentiment(seed, source))
+
+
+LOADERS = [load_placements, load_cube, load_bitmap_index, load_filter_options, load_overview,
+           load_job_title_frequencies, load_regions, load_geo_layer, load_cohorts, load_degree,
+           load_performance, load_market_trends, load_comparison, load_satisfaction_time,
+           load_comments, load_sentiment, load_feedback_index]
+
+
+def invalidate(*loaders):
+    """Vide le cache des loaders donnés (tous les loaders si aucun n'est précisé)."""
+    for loader in loaders or LOADERS:
+        loader.clear()
@@ -0,0 +1,97 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+# Largeur (en pixels) d'un graphique placé dans une colonne du tableau de bord
+CHART_WIDTH = 700
+
+# Nombre maximal de points envoyés par pixel de largeur
+POINTS_PER_PIXEL = 1
+
+# Au-delà de ce nombre de points, la trace est rendue en WebGL (Scattergl)
+WEBGL_THRESHOLD = 1000
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets : renvoie les indices des points conservés.
+
+    Conserve la forme visuelle de la série (pics et creux) avec `n_out` points.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = np.asarray(y, dtype=float)
+
+    # Bornes des seaux (le premier et le dernier point sont toujours conservés)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        # Point moyen du seau suivant, sommet du triangle
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax(x, y, n_out):
+    """Seaux min/max : conserve le minimum et le maximum de chaque seau (vectorisé)."""
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+    n_buckets = n_out // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)[:-1]
+    lengths = np.diff(np.append(edges, n))
+
+    # Position de l'extremum dans chaque seau, à partir d'un tri par seau
+    bucket = np.repeat(np.arange(n_buckets), lengths)
+    order = np.lexsort((y, bucket))
+    last = np.cumsum(lengths) - 1
+    selected = np.concatenate([order[edges], order[last]])
+    return np.unique(selected)
+
+
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+
+def max_points(width=CHART_WIDTH):
+    return int(width * POINTS_PER_PIXEL)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def downsample(x, y, n_out, method="lttb"):
+    """Série réduite à au plus `n_out` points, mise en cache par série et budget de points."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    kept = METHODS[method](x, y, n_out)
+    return x[kept], y[kept]
+
+
+def line_trace(x, y, width=CHART_WIDTH, method="lttb", **kwargs):
+    """Trace de série temporelle plafonnée à `max_points(width)` points.
+
+    Les séries volumineuses passent en Scattergl et sans marqueurs.
+    """
+    n = len(y)
+    if n > max_points(width):
+        x, y = downsample(np.asarray(x), np.asarray(y), max_points(width), method)
+    if n > WEBGL_THRESHOLD:
+        kwargs["mode"] = "lines"
+        return go.Scattergl(x=x, y=y, **kwargs)
+    return go.Scatter(x=x, y=y, **kwargs)
@@ -0,0 +1,75 @@
+import gzip
+import io
+import re
+
+from profiling import import_module
+
+# Nombre de lignes converties à la fois : la mémoire utilisée pendant l'export
+# est bornée par la taille d'un bloc, quelle que soit la taille du jeu exporté
+CHUNK_ROWS = 100_000
+
+# Formats d'export : extension du fichier et type MIME
+FORMATS = {
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "CSV": ("csv", "text/csv"),
+}
+
+
+def chunks(frame, mask=None, chunk_rows=CHUNK_ROWS):
+    """Découpe `frame` (filtré par le masque booléen `mask`) en blocs de lignes.
+
+    Le filtre est appliqué bloc par bloc : le jeu filtré n'est jamais copié en entier.
+    """
+    for start in range(0, max(len(frame), 1), chunk_rows):
+        chunk = frame.iloc[start:start + chunk_rows]
+        yield chunk if mask is None else chunk[mask[start:start + chunk_rows]]
+
+
+def write_csv(blocks, fileobj, compress=True):
+    raw = gzip.GzipFile(fileobj=fileobj, mode="wb", mtime=0) if compress else fileobj
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    header = True
+    for block in blocks:
+        block.to_csv(text, index=False, header=header)
+        header = False
+    text.flush()
+    # detach() : le fichier de destination reste ouvert
+    text.detach()
+    if compress:
+        raw.close()
+
+
+def write_parquet(blocks, fileobj):
+    # pyarrow n'est importé qu'au premier export Parquet
+    pa = import_module("pyarrow")
+    pq = import_module("pyarrow.parquet")
+    writer = None
+    for block in blocks:
+        table = pa.Table.from_pandas(block, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(fileobj, table.schema, compression="zstd")
+        # Un groupe de lignes par bloc
+        writer.write_table(table)
+    writer.close()
+
+
+def export(blocks, fmt):
+    """Écrit les blocs dans le format demandé et renvoie le fichier, prêt à être lu."""
+    buffer = io.BytesIO()
+    if fmt == "Parquet":
+        write_parquet(blocks, buffer)
+    else:
+        write_csv(blocks, buffer, compress=fmt == "CSV (gzip)")
+    buffer.seek(0)
+    return buffer
+
+
+def deferred(make_blocks, fmt):
+    """Export différé pour st.download_button : rien n'est généré avant le clic."""
+    return lambda: export(make_blocks(), fmt)
+
+
+def file_name(name, fmt):
+    slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+    return f"{slug}.{FORMATS[fmt][0]}"
@@ -0,0 +1,78 @@
+import bisect
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from sentiment import SENTIMENT_LABELS
+
+# Nombre de commentaires affichés par page dans l'explorateur
+PAGE_SIZE = 20
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+class FeedbackIndex:
+    """Index inversé des commentaires scorés, pour la recherche et la pagination côté serveur.
+
+    Chaque texte distinct est découpé en mots une seule fois : l'index associe
+    chaque mot aux textes qui le contiennent, et chaque catégorie de sentiment
+    à son masque de lignes. Une recherche ne parcourt donc que le vocabulaire
+    et des tableaux NumPy ; seule la page affichée est extraite du jeu.
+    """
+
+    def __init__(self, scored):
+        self.frame = scored
+        self.codes, self.texts = pd.factorize(scored["Comment"])
+        postings = defaultdict(set)
+        for code, text in enumerate(self.texts):
+            for token in tokenize(text):
+                postings[token].add(code)
+        self.vocabulary = sorted(postings)
+        self.postings = {token: np.fromiter(codes, dtype=np.int64) for token, codes in postings.items()}
+        sentiment = np.asarray(scored["Sentiment"])
+        self.sentiment_masks = {label: sentiment == label for label in SENTIMENT_LABELS}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _texts_matching(self, term):
+        # Textes contenant un mot commençant par `term` (recherche à la frappe)
+        start = bisect.bisect_left(self.vocabulary, term)
+        matches = []
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(self.postings[token])
+        return np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int64)
+
+    def mask(self, query="", sentiments=None):
+        """Masque booléen des commentaires contenant tous les mots de `query`, parmi `sentiments`."""
+        if sentiments is None:
+            mask = np.ones(len(self), dtype=bool)
+        else:
+            mask = np.zeros(len(self), dtype=bool)
+            for label in sentiments:
+                mask |= self.sentiment_masks[label]
+        texts = None
+        for term in tokenize(query):
+            matching = self._texts_matching(term)
+            texts = matching if texts is None else np.intersect1d(texts, matching, assume_unique=True)
+        if texts is not None:
+            mask &= np.isin(self.codes, texts)
+        return mask
+
+    def counts(self, mask=None):
+        """Nombre de commentaires par catégorie de sentiment (parmi `mask`)."""
+        return pd.Series({label: int(np.count_nonzero(label_mask if mask is None else label_mask & mask))
+                          for label, label_mask in self.sentiment_masks.items()})
+
+    def page(self, mask, number, page_size=PAGE_SIZE):
+        """Lignes de la page `number` (à partir de 1) parmi les commentaires sélectionnés par `mask`."""
+        rows = np.flatnonzero(mask)[(number - 1) * page_size:number * page_size]
+        return self.frame.iloc[rows]
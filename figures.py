@@ -0,0 +1,76 @@
+from collections import Counter
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from downsample import WEBGL_THRESHOLD
+
+# Modèle Plotly partagé par tous les graphiques du tableau de bord. Il remplace
+# le modèle par défaut (plusieurs Ko sérialisés dans chaque figure) par le
+# strict nécessaire, et évite de répéter les mêmes update_layout partout.
+TEMPLATE_NAME = "employability"
+
+COLORS = ["#636EFA", "#EF553B", "#00CC96", "#AB63FA", "#FFA15A"]
+
+pio.templates[TEMPLATE_NAME] = go.layout.Template(layout=dict(
+    font=dict(family="Arial, sans-serif", size=12, color="#2a2a2a"),
+    title_font=dict(size=16),
+    legend_title_font=dict(size=14),
+    colorway=COLORS,
+    plot_bgcolor='#F7F7F7',
+    paper_bgcolor='#FAFAFA',
+    xaxis=dict(showline=True, linewidth=2, linecolor='black'),
+    yaxis=dict(showline=True, linewidth=2, linecolor='black'),
+))
+pio.templates.default = TEMPLATE_NAME
+
+# Propriétés de trace égales à la valeur par défaut de Plotly : inutile de les envoyer
+_DEFAULTS = {
+    "xaxis": "x",
+    "yaxis": "y",
+    "orientation": "v",
+    "showlegend": True,
+    "legendgroup": "",
+}
+_NESTED_DEFAULTS = {
+    ("marker", "symbol"): "circle",
+    ("line", "dash"): "solid",
+}
+
+
+def _strip_defaults(trace, shared_groups):
+    props = trace.to_plotly_json()
+    for prop, default in _DEFAULTS.items():
+        if props.get(prop) == default:
+            trace[prop] = None
+    # Un groupe de légende propre à la seule trace équivaut à pas de groupe
+    group = props.get("legendgroup")
+    if group and group == props.get("name") and group not in shared_groups:
+        trace["legendgroup"] = None
+    for (parent, prop), default in _NESTED_DEFAULTS.items():
+        if props.get(parent, {}).get(prop) == default:
+            trace[parent][prop] = None
+
+
+def compact(fig, webgl_threshold=WEBGL_THRESHOLD):
+    """Allège la figure avant sérialisation.
+
+    Retire les propriétés de trace redondantes et passe en WebGL (Scattergl)
+    les nuages de points dont le nombre de points dépasse `webgl_threshold`.
+    """
+    groups = Counter(trace.legendgroup for trace in fig.data if trace["legendgroup"])
+    shared_groups = {group for group, count in groups.items() if count > 1}
+    traces = []
+    for trace in fig.data:
+        if isinstance(trace, go.Scatter) and trace.x is not None and len(trace.x) > webgl_threshold:
+            trace = go.Scattergl(trace.to_plotly_json(), skip_invalid=True)
+        _strip_defaults(trace, shared_groups)
+        traces.append(trace)
+    fig.data = []
+    fig.add_traces(traces)
+    return fig
+
+
+def payload_bytes(fig):
+    """Taille (en octets) de la figure sérialisée en JSON, telle qu'envoyée au navigateur."""
+    return len(pio.to_json(fig, validate=False))
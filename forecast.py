@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Nombre de périodes prévues au-delà de la dernière observation
+HORIZON = 1
+
+# Quantile de la loi normale pour un intervalle de prévision à 95 %
+Z_95 = 1.959964
+
+
+@dataclass
+class TrendModel:
+    """Paramètres ajustés pour un ensemble de séries (une valeur par série)."""
+
+    intercept: np.ndarray
+    slope: np.ndarray
+    sigma: np.ndarray
+    n: np.ndarray
+    t_mean: np.ndarray
+    t_var: np.ndarray
+    seasonal: np.ndarray  # (séries, période) ; période 1 = pas de saisonnalité
+    t_start: float
+    step: float  # pas d'échantillonnage : la phase saisonnière se compte en pas
+
+
+def fit(t, Y, period=1):
+    """Ajuste une tendance linéaire (+ saisonnalité additive) sur toutes les séries à la fois.
+
+    `Y` est une matrice (séries × instants) pouvant contenir des NaN ; `t` les
+    instants communs. Tous les calculs sont vectorisés sur l'axe des séries.
+    """
+    t = np.asarray(t, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    observed = ~np.isnan(Y)
+    n = observed.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+    t_mean = np.where(observed, t, 0.0).sum(axis=1) / safe_n
+    dt = np.where(observed, t - t_mean[:, None], 0.0)
+    t_var = (dt ** 2).sum(axis=1)
+
+    phase = np.arange(len(t)) % period
+    seasonal = np.zeros((len(Y), period))
+    # Ajustement alterné (backfitting) de la tendance et de la saisonnalité
+    for _ in range(3 if period > 1 else 1):
+        Yz = np.where(observed, Y - seasonal[:, phase], 0.0)
+        y_mean = Yz.sum(axis=1) / safe_n
+        slope = np.divide((dt * (Yz - y_mean[:, None])).sum(axis=1), t_var,
+                          out=np.zeros_like(t_var), where=t_var > 0)
+        intercept = y_mean - slope * t_mean
+        residuals = np.where(observed, Y - (intercept[:, None] + slope[:, None] * t), 0.0)
+        if period > 1:
+            # Composante saisonnière : moyenne des résidus par phase, centrée sur zéro
+            for p in range(period):
+                in_phase = observed[:, phase == p].sum(axis=1)
+                seasonal[:, p] = residuals[:, phase == p].sum(axis=1) / np.maximum(in_phase, 1)
+            seasonal -= seasonal.mean(axis=1, keepdims=True)
+    residuals = np.where(observed, residuals - seasonal[:, phase], 0.0)
+
+    dof = np.maximum(n - 2 - (period - 1), 1)
+    sigma = np.sqrt((residuals ** 2).sum(axis=1) / dof)
+    step = float(np.median(np.diff(t))) if len(t) > 1 else 1.0
+    return TrendModel(intercept, slope, sigma, n, t_mean, t_var, seasonal, float(t[0]), step)
+
+
+def predict(model, t_new, z=Z_95):
+    """Prévision moyenne et bornes de l'intervalle de prévision, (séries × instants)."""
+    t_new = np.asarray(t_new, dtype=float)
+    period = model.seasonal.shape[1]
+    # Même phase qu'à l'ajustement (rang de l'instant), quel que soit le pas
+    phase = np.round((t_new - model.t_start) / model.step).astype(int) % period
+    mean = model.intercept[:, None] + model.slope[:, None] * t_new + model.seasonal[:, phase]
+
+    # Erreur de prévision d'une régression linéaire simple
+    leverage = np.divide((t_new - model.t_mean[:, None]) ** 2, model.t_var[:, None],
+                         out=np.zeros((len(mean), len(t_new))), where=model.t_var[:, None] > 0)
+    se = model.sigma[:, None] * np.sqrt(1 + 1 / np.maximum(model.n, 1)[:, None] + leverage)
+    return mean, mean - z * se, mean + z * se
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def fit_cached(t, Y, period=1):
+    # Streamlit indexe le cache sur le contenu des tableaux : les paramètres ne
+    # sont réajustés que lorsque les données changent
+    return fit(t, Y, period)
+
+
+def forecast_frame(wide, horizon=HORIZON, period=1, bounds=(0, 100)):
+    """Prévisions pour chaque colonne d'un tableau large (index = instants, colonnes = séries).
+
+    Renvoie un DataFrame long : `series`, `time`, `forecast`, `lower`, `upper`.
+    """
+    t = wide.index.to_numpy(dtype=float)
+    model = fit_cached(t, wide.to_numpy(dtype=float).T, period)
+    t_new = t[-1] + model.step * np.arange(1, horizon + 1)
+    mean, lower, upper = (np.clip(a, *bounds) for a in predict(model, t_new))
+
+    n_series = wide.shape[1]
+    return pd.DataFrame({
+        "series": np.repeat(wide.columns.astype(str), horizon),
+        "time": np.tile(t_new, n_series),
+        "forecast": mean.ravel().round(1),
+        "lower": lower.ravel().round(1),
+        "upper": upper.ravel().round(1),
+    })
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+# Taille (en degrés) des hexagones utilisés quand les recrutements sont géolocalisés
+# mais qu'aucun fichier de régions n'est fourni
+HEX_SIZE = 2.0
+
+_SQRT3 = np.sqrt(3)
+
+
+class GeoLayer:
+    """Couche géographique agrégée, prête à être tracée en choroplèthe.
+
+    `frame` contient une ligne par zone (`location`, `Recruits`, `label`) ; sa
+    taille est bornée par le nombre de zones, quel que soit le nombre de recrues.
+    `geojson` vaut None pour les pays (géométries intégrées à Plotly).
+    """
+
+    def __init__(self, kind, frame, geojson=None):
+        self.kind = kind
+        self.frame = frame
+        self.geojson = geojson
+
+
+def country_layer(recruits_by_country, iso3):
+    """Couche par pays, à partir du nombre de recrues par pays (Series)."""
+    frame = pd.DataFrame({
+        "label": recruits_by_country.index.astype(str),
+        "Recruits": recruits_by_country.to_numpy(),
+    })
+    # Seuls les pays dont le code ISO est connu peuvent être placés sur la carte
+    frame["location"] = frame["label"].map(iso3)
+    frame = frame.dropna(subset=["location"]).reset_index(drop=True)
+    return GeoLayer("country", frame)
+
+
+def hex_bins(lat, lon, size=HEX_SIZE):
+    """Affecte chaque point à un hexagone (coordonnées axiales q, r), de façon vectorisée."""
+    x = np.asarray(lon, dtype=float) / size
+    y = np.asarray(lat, dtype=float) / size
+    q = _SQRT3 / 3 * x - y / 3
+    r = 2 / 3 * y
+
+    # Arrondi en coordonnées cubiques : on corrige l'axe dont l'erreur est la plus grande
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype(np.int32), rr.astype(np.int32)
+
+
+def _hex_polygon(q, r, size):
+    center_x = size * _SQRT3 * (q + r / 2)
+    center_y = size * 1.5 * r
+    # Sommets dans le sens horaire : pour d3-geo (cartes Plotly), un anneau
+    # extérieur anti-horaire désigne le reste du globe
+    angles = np.deg2rad(30 - 60 * np.arange(7))
+    return [[float(center_x + size * np.cos(a)), float(center_y + size * np.sin(a))] for a in angles]
+
+
+def hex_layer(lat, lon, size=HEX_SIZE):
+    """Couche d'hexagones : nombre de recrues par hexagone non vide."""
+    q, r = hex_bins(lat, lon, size)
+    counts = pd.DataFrame({"q": q, "r": r}).value_counts().rename("Recruits").reset_index()
+    counts["location"] = counts["q"].astype(str) + "," + counts["r"].astype(str)
+    counts["label"] = [f"Hex {loc}" for loc in counts["location"]]
+
+    geojson = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "id": loc,
+         "geometry": {"type": "Polygon", "coordinates": [_hex_polygon(hq, hr, size)]}}
+        for loc, hq, hr in zip(counts["location"], counts["q"], counts["r"])
+    ]}
+    return GeoLayer("hex", counts[["location", "Recruits", "label"]], geojson)
+
+
+def load_regions(path, name_field="name", tolerance=0.05):
+    """Lit un fichier de polygones (GeoJSON, Shapefile, GeoPackage...) en WGS84.
+
+    Les géométries sont simplifiées pour limiter la taille du GeoJSON envoyé au navigateur.
+    """
+    import geopandas as gpd
+
+    regions = gpd.read_file(path).to_crs(4326)[[name_field, "geometry"]]
+    regions = regions.rename(columns={name_field: "region"})
+    regions["geometry"] = regions.geometry.simplify(tolerance, preserve_topology=True)
+    return regions.reset_index(drop=True)
+
+
+def _clockwise(geometry):
+    # Anneaux extérieurs dans le sens horaire, trous dans le sens anti-horaire (convention d3-geo,
+    # inverse de celle de la RFC 7946)
+    from shapely.geometry import MultiPolygon
+    from shapely.geometry.polygon import orient
+
+    if isinstance(geometry, MultiPolygon):
+        return MultiPolygon([orient(part, sign=-1.0) for part in geometry.geoms])
+    return orient(geometry, sign=-1.0)
+
+
+def region_layer(lat, lon, regions):
+    """Couche par région : chaque point est affecté au polygone qui le contient.
+
+    La jointure spatiale s'appuie sur l'index spatial (STRtree) des régions :
+    chaque point n'est testé que contre les polygones dont l'emprise le contient.
+    """
+    import geopandas as gpd
+
+    points = gpd.GeoDataFrame(geometry=gpd.points_from_xy(lon, lat), crs=4326)
+    joined = gpd.sjoin(points, regions, how="inner", predicate="within")
+    counts = joined.groupby("region").size().rename("Recruits").reset_index()
+    counts = counts.rename(columns={"region": "location"})
+    counts["label"] = counts["location"].astype(str)
+
+    used = regions[regions["region"].isin(counts["location"])]
+    geojson = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "id": str(name), "geometry": _clockwise(geometry).__geo_interface__}
+        for name, geometry in zip(used["region"], used.geometry)
+    ]}
+    return GeoLayer("region", counts, geojson)
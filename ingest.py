@@ -0,0 +1,206 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+# Schéma déclaré des enregistrements de placement (colonne -> dtype compact)
+PLACEMENT_SCHEMA = {
+    "year": "int16",
+    "cohort": "category",
+    "sector": "category",
+    "degree_level": "category",
+    "country": "category",
+    "company": "category",
+    "placed": "bool",
+}
+
+# Colonnes facultatives, conservées si elles sont présentes dans le fichier
+OPTIONAL_SCHEMA = {
+    "student_id": "uint32",
+    "job_title": "category",
+    "lat": "float32",
+    "lon": "float32",
+    "satisfaction": "float32",
+    "comment": "category",
+}
+
+# Types des colonnes facultatives pouvant contenir des valeurs manquantes
+NULLABLE_DTYPES = ("category", "float32")
+
+CHUNK_SIZE = 250_000
+
+_TRUE_VALUES = {"1", "true", "yes", "y", "placed"}
+_FALSE_VALUES = {"0", "false", "no", "n", "not placed", ""}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+@dataclass
+class IngestStats:
+    rows: int = 0
+    invalid_rows: int = 0
+    seconds: float = 0.0
+    memory_bytes: int = 0
+    rejected_files: list = field(default_factory=list)
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        summary = (f"{self.rows:,} rows ({self.invalid_rows:,} rejected) in {self.seconds:.2f}s "
+                   f"- {self.rows_per_sec:,.0f} rows/s - {self.memory_bytes / 2**20:.1f} MiB in memory")
+        if self.rejected_files:
+            summary += f" - {len(self.rejected_files)} file(s) rejected"
+        return summary
+
+
+def _read_chunks(path, columns, chunk_size):
+    path = Path(path)
+    if path.suffix == ".parquet" or path.is_dir():
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(path, format="parquet")
+        available = [c for c in columns if c in dataset.schema.names]
+        for batch in dataset.to_batches(columns=available, batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif path.suffix in (".csv", ".gz", ".bz2", ".zip", ".xz"):
+        # Les chaînes sont lues telles quelles puis converties après validation
+        yield from pd.read_csv(path, usecols=lambda c: c in columns, dtype=str,
+                               keep_default_na=False, chunksize=chunk_size)
+    else:
+        raise SchemaError(f"Unsupported placement file format: {path.name}")
+
+
+def _to_bool(column):
+    if column.dtype == bool:
+        return column, pd.Series(True, index=column.index)
+    values = column.astype(str).str.strip().str.lower()
+    is_true = values.isin(_TRUE_VALUES)
+    return is_true, is_true | values.isin(_FALSE_VALUES)
+
+
+def validate_chunk(chunk):
+    """Valide un bloc et le convertit au schéma compact.
+
+    Renvoie le bloc typé (lignes invalides retirées) et le nombre de lignes rejetées.
+    """
+    missing = set(PLACEMENT_SCHEMA) - set(chunk.columns)
+    if missing:
+        raise SchemaError(f"Missing required column(s): {', '.join(sorted(missing))}")
+
+    valid = pd.Series(True, index=chunk.index)
+    typed = {}
+    for column, dtype in {**PLACEMENT_SCHEMA, **OPTIONAL_SCHEMA}.items():
+        if column not in chunk.columns:
+            continue
+        values = chunk[column]
+        if dtype == "bool":
+            values, ok = _to_bool(values)
+        elif dtype == "category":
+            values = values.astype("string").str.strip().replace("", pd.NA)
+            ok = values.notna()
+        else:
+            values = pd.to_numeric(values, errors="coerce")
+            integer = np.dtype(dtype).kind in "iu"
+            info = np.iinfo(dtype) if integer else np.finfo(dtype)
+            ok = values.notna() & values.between(info.min, info.max)
+            if integer:
+                # Valeur non entière (« 2021.7 ») rejetée plutôt que tronquée par astype
+                ok &= values.mod(1) == 0
+        if column in OPTIONAL_SCHEMA and dtype in NULLABLE_DTYPES:
+            # Colonne facultative : une valeur manquante est conservée comme telle
+            ok = ok | values.isna()
+        valid &= ok
+        typed[column] = values
+
+    typed = pd.DataFrame(typed)[valid]
+    for column, dtype in {**PLACEMENT_SCHEMA, **OPTIONAL_SCHEMA}.items():
+        if column in typed:
+            typed[column] = typed[column].astype(dtype)
+    return typed, int((~valid).sum())
+
+
+def _missing_column(like, size):
+    # Colonne facultative absente d'un bloc : valeurs manquantes du type de `like`
+    if isinstance(like.dtype, pd.CategoricalDtype):
+        return pd.Series(pd.Categorical.from_codes(np.full(size, -1), like.cat.categories[:0]))
+    return pd.Series(np.full(size, np.nan, dtype=like.dtype))
+
+
+def concat_records(chunks):
+    """Concatène des blocs d'enregistrements validés en conservant le schéma compact.
+
+    Les colonnes facultatives présentes dans certains blocs seulement sont
+    complétées par des valeurs manquantes ; celles dont le type n'en admet pas
+    (identifiants entiers) sont abandonnées.
+    """
+    if not chunks:
+        return pd.DataFrame({c: pd.Series(dtype=d) for c, d in PLACEMENT_SCHEMA.items()})
+    # Les catégories diffèrent d'un bloc à l'autre : on les unifie colonne par
+    # colonne pour que le résultat reste catégoriel (et non object)
+    columns = {}
+    for column in dict.fromkeys(c for chunk in chunks for c in chunk.columns):
+        if not all(column in chunk for chunk in chunks):
+            if OPTIONAL_SCHEMA[column] not in NULLABLE_DTYPES:
+                logger.warning("Dropping column %r, missing from some placement files", column)
+                continue
+            like = next(chunk[column] for chunk in chunks if column in chunk)
+            parts = [chunk[column] if column in chunk else _missing_column(like, len(chunk))
+                     for chunk in chunks]
+        else:
+            parts = [chunk[column] for chunk in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[column] = pd.Series(union_categoricals(parts, sort_categories=True))
+        else:
+            columns[column] = pd.Series(np.concatenate([part.to_numpy() for part in parts]))
+    return pd.DataFrame(columns)
+
+
+def _validated_chunks(path, columns, chunk_size, stats):
+    # Fichier lu en entier avant d'être retenu : un fichier rejeté n'apporte aucune ligne
+    chunks, invalid_rows = [], 0
+    for raw in _read_chunks(path, columns, chunk_size):
+        chunk, rejected = validate_chunk(raw)
+        invalid_rows += rejected
+        chunks.append(chunk)
+    stats.invalid_rows += invalid_rows
+    return chunks
+
+
+def load_placement_records(path, chunk_size=CHUNK_SIZE):
+    """Lit un fichier CSV/Parquet (ou une liste de fichiers) d'enregistrements de placement par blocs.
+
+    Renvoie le DataFrame typé et les statistiques d'ingestion.
+    """
+    stats = IngestStats()
+    start = time.perf_counter()
+    columns = list(PLACEMENT_SCHEMA) + list(OPTIONAL_SCHEMA)
+
+    chunks = []
+    if isinstance(path, (list, tuple)):
+        # Liste explicite de fichiers (répertoire, nouveaux fichiers d'un répertoire
+        # surveillé) : un fichier illisible ou hors schéma est écarté seul
+        for file in path:
+            try:
+                chunks.extend(_validated_chunks(file, columns, chunk_size, stats))
+            except (ValueError, OSError):
+                logger.exception("Rejected placement file %s", file)
+                stats.rejected_files.append(file)
+    else:
+        chunks.extend(_validated_chunks(path, columns, chunk_size, stats))
+
+    records = concat_records(chunks)
+    stats.rows = len(records)
+    stats.seconds = time.perf_counter() - start
+    stats.memory_bytes = int(records.memory_usage(deep=True).sum())
+    logger.info("Loaded placement records from %s: %s", path, stats.summary())
+    return records, stats
@@ -0,0 +1,183 @@
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+# Instrumentation visible (panneau + journaux) : DASHBOARD_PROFILE=1 ou ?profile=1
+PROFILE_ENV = os.environ.get("DASHBOARD_PROFILE", "0") not in ("", "0", "false")
+
+# Instant de chargement du tableau de bord dans ce processus (référence du démarrage)
+PROCESS_START = time.perf_counter()
+
+# Rapport de démarrage du processus : imports différés et première exécution
+_startup = {"imports": {}, "sections": {}, "first_run_s": None}
+_startup_lock = threading.Lock()
+
+# Pile des mesures en cours ; chaque session Streamlit s'exécute dans son propre thread
+_local = threading.local()
+
+
+def enabled():
+    return PROFILE_ENV or st.query_params.get("profile") in ("1", "true")
+
+
+def _enable_logging():
+    # Le logger `profiling` n'a pas de handler par défaut (niveau effectif WARNING) :
+    # avec le profilage actif, ses journaux INFO sont émis, sur stderr si aucune
+    # configuration de logging n'en prévoit la destination
+    with _startup_lock:
+        if logger.level == logging.NOTSET or logger.level > logging.INFO:
+            logger.setLevel(logging.INFO)
+        if not logger.hasHandlers():
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+            logger.addHandler(handler)
+
+
+def start_run():
+    """Réinitialise les mesures au début d'une exécution complète du script."""
+    st.session_state["_timings"] = {}
+    if enabled():
+        _enable_logging()
+
+
+@contextmanager
+def timed(name):
+    """Mesure la durée du bloc et l'enregistre dans la session.
+
+    Les mesures imbriquées sont nommées d'après leur parent
+    (« Overview / WordCloud.generate ») ; des appels répétés s'additionnent.
+    Utilisable aussi comme décorateur.
+    """
+    stack = _local.__dict__.setdefault("stack", [])
+    key = " / ".join([*stack, name])
+    recording = get_script_run_ctx() is not None
+    if recording and not stack:
+        # Nouvelle exécution d'une section (ou d'un fragment) : on repart de zéro
+        timings = st.session_state.setdefault("_timings", {})
+        # list() : les threads de calcul des artefacts peuvent ajouter des mesures en parallèle
+        for stale in [k for k in list(timings) if k == key or k.startswith(key + " / ")]:
+            del timings[stale]
+
+    stack.append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        if recording:
+            timings = st.session_state.setdefault("_timings", {})
+            timings[key] = timings.get(key, 0.0) + elapsed
+
+
+def timings():
+    return dict(st.session_state.get("_timings", {}))
+
+
+def import_module(name):
+    """Importe un module lourd à la première utilisation, en mesurant la durée de l'import."""
+    module = sys.modules.get(name)
+    # Module en cours d'import dans un autre thread (threads de l'ordonnanceur) :
+    # importlib attend la fin de son initialisation
+    if module is None or getattr(getattr(module, "__spec__", None), "_initializing", False):
+        start = time.perf_counter()
+        with timed(f"import {name}"):
+            module = importlib.import_module(name)
+        with _startup_lock:
+            _startup["imports"].setdefault(name, time.perf_counter() - start)
+    return module
+
+
+def record_startup():
+    """Fige le rapport de démarrage à la fin de la première exécution du processus."""
+    with _startup_lock:
+        if _startup["first_run_s"] is not None:
+            return
+        _startup["first_run_s"] = time.perf_counter() - PROCESS_START
+        _startup["sections"] = {step: seconds for step, seconds in timings().items() if " / " not in step}
+    logger.info(json.dumps({"event": "dashboard_startup", **startup_report_dict()}))
+
+
+def startup_report_dict():
+    return {
+        "first_run_ms": round((_startup["first_run_s"] or 0) * 1000, 1),
+        "imports_ms": {name: round(s * 1000, 1) for name, s in _startup["imports"].items()},
+        "sections_ms": {name: round(s * 1000, 1) for name, s in _startup["sections"].items()},
+    }
+
+
+def startup_report():
+    """Rapport de démarrage : première exécution, imports différés et sections."""
+    rows = [("First run (total)", _startup["first_run_s"] or 0.0)]
+    rows += [(f"import {name}", seconds) for name, seconds in _startup["imports"].items()]
+    rows += list(_startup["sections"].items())
+    return pd.DataFrame({
+        "Step": [step for step, _ in rows],
+        "Time (ms)": [round(seconds * 1000, 1) for _, seconds in rows],
+    })
+
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart, dont la durée (sérialisation comprise) est mesurée.
+
+    Avec le profilage activé, la taille de la figure sérialisée est aussi relevée.
+    """
+    title = fig.layout.title.text or "figure"
+    if enabled():
+        from figures import payload_bytes
+
+        st.session_state.setdefault("_payloads", {})[title] = payload_bytes(fig)
+    with timed(f"st.plotly_chart ({title})"):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def payload_report():
+    """Taille des figures envoyées au navigateur, en Ko."""
+    payloads = st.session_state.get("_payloads", {})
+    return pd.DataFrame({
+        "Chart": list(payloads),
+        "Size (KB)": [round(size / 1024, 1) for size in payloads.values()],
+    })
+
+
+def report():
+    """Mesures de l'exécution courante, des plus coûteuses aux moins coûteuses."""
+    measures = timings()
+    return pd.DataFrame({
+        "Step": list(measures),
+        "Time (ms)": [round(seconds * 1000, 1) for seconds in measures.values()],
+    }).sort_values("Time (ms)", ascending=False, ignore_index=True)
+
+
+def log_run():
+    """Émet les mesures de l'exécution sous forme de journal structuré (JSON)."""
+    logger.info(json.dumps({
+        "event": "dashboard_rerun_profile",
+        "session": getattr(get_script_run_ctx(), "session_id", None),
+        "timings_ms": {step: round(seconds * 1000, 2) for step, seconds in timings().items()},
+    }))
+
+
+def render_panel():
+    """Panneau latéral des durées par section et par appel coûteux."""
+    with st.sidebar.expander("Profiling", expanded=True):
+        st.dataframe(report(), hide_index=True)
+        st.caption("Process startup")
+        st.dataframe(startup_report(), hide_index=True)
+        st.caption("Chart payloads")
+        st.dataframe(payload_report(), hide_index=True)
+        from store import get_store
+
+        st.caption("Shared store")
+        st.dataframe(pd.DataFrame([get_store().stats()]), hide_index=True)
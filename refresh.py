@@ -0,0 +1,152 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+import streamlit as st
+from pandas.api.types import union_categoricals
+
+import data
+from cube import PlacementCube
+from ingest import concat_records, load_placement_records
+from sentiment import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Intervalle (en secondes) entre deux inspections des répertoires surveillés
+REFRESH_INTERVAL = float(os.environ.get("REFRESH_INTERVAL", 30))
+
+
+class DataRefresher:
+    """Ingestion incrémentale des fichiers déposés dans les répertoires de données.
+
+    Les répertoires sont en ajout seul : seuls les fichiers apparus depuis le
+    dernier passage sont lus, puis fusionnés dans les jeux partagés (cube,
+    fréquences des métiers, commentaires scorés) sans tout recalculer.
+    Chaque mise à jour incrémente la version du jeu concerné.
+    """
+
+    def __init__(self, source=data.DEFAULT_SOURCE, comments_source=data.COMMENTS_SOURCE,
+                 seed=data.DEFAULT_SEED, interval=REFRESH_INTERVAL):
+        self.source = source if os.path.isdir(source) else None
+        self.comments_source = comments_source
+        self.seed = seed
+        self.interval = interval
+        self.versions = {"placements": 0, "comments": 0}
+        self.last_update = None
+        self._last_poll = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def watching(self):
+        return self.source is not None or self.comments_source is not None
+
+    def version(self):
+        return sum(self.versions.values())
+
+    def _new_files(self, directory, suffixes):
+        seen = data.loaded_files.get(directory, set())
+        return [file for file in data.data_files(directory, suffixes) if file not in seen]
+
+    def poll(self, force=False):
+        """Ingère les fichiers arrivés depuis le dernier passage et renvoie la version des données.
+
+        Les répertoires ne sont inspectés qu'une fois par intervalle, quel que
+        soit le nombre de sessions ouvertes.
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._last_poll < self.interval:
+                return self.version()
+            self._last_poll = time.monotonic()
+            if self.source is not None:
+                # Chargement initial (mis en cache) avant de comparer les listes de fichiers
+                data.load_placements(self.source, self.seed)
+                files = self._new_files(self.source, data.PLACEMENT_SUFFIXES)
+                if files:
+                    self._ingest(files, self._append_placements, self.source)
+            if self.comments_source is not None:
+                data.load_comments(self.seed, self.comments_source)
+                files = self._new_files(self.comments_source, data.COMMENT_SUFFIXES)
+                if files:
+                    self._ingest(files, self._append_comments, self.comments_source)
+            return self.version()
+
+    def _ingest(self, files, append, directory):
+        try:
+            self.last_update = append(files)
+        except Exception:
+            # Toute erreur est journalisée sans interrompre la surveillance ; les
+            # fichiers rejetés ne sont pas réessayés à chaque passage
+            logger.exception("Could not ingest new files %s", files)
+        data.loaded_files.setdefault(directory, set()).update(files)
+
+    def _append_placements(self, files):
+        source, seed = self.source, self.seed
+        # Jeux courants lus avant toute mise à jour : le cube et les fréquences
+        # correspondent exactement aux enregistrements déjà ingérés
+        records = data.load_placements(source, seed)
+        cube = data.load_cube(source, seed)
+        frequencies = data.load_job_title_frequencies(source, seed)
+        # Commentaires lus dans les enregistrements : lus eux aussi avant la mise à
+        # jour, s'ils sont déjà en cache (sinon ils seront relus en entier)
+        comments = None
+        if self.comments_source is None and "comment" in records and self._comments_cached(None):
+            comments = data.load_comments(seed, None), data.load_sentiment(seed, None)
+
+        # Fichiers hors schéma écartés un par un ; colonnes facultatives manquantes
+        # d'un côté ou de l'autre complétées par concat_records
+        delta, stats = load_placement_records(files)
+        if not len(delta):
+            return f"No valid placement records in {len(files)} new file(s)"
+
+        data.load_placements.update(concat_records([records, delta]), source, seed)
+        data.load_cube.update(cube.merge(PlacementCube.from_records(delta, cube.dimensions)), source, seed)
+        # Fréquences filtrées (barre de filtres) recalculées à la prochaine lecture
+        data.load_job_title_frequencies.clear()
+        data.load_job_title_frequencies.update(
+            dict(Counter(frequencies) + Counter(data.job_title_counts(delta))), source, seed)
+        # Agrégats dérivés : recalculés par roll-up du cube mis à jour à la prochaine
+        # lecture ; index bitmap reconstruit sur l'ensemble des enregistrements
+        data.invalidate(data.load_bitmap_index, data.load_filter_options, data.load_overview,
+                        data.load_geo_layer, data.load_cohorts, data.load_degree,
+                        data.load_market_trends, data.load_comparison)
+        if self.comments_source is None and "comment" in delta:
+            if comments is not None:
+                # Seuls les commentaires des nouveaux fichiers sont scorés
+                self._merge_comments(*comments, delta["comment"].dropna(), None)
+            else:
+                data.invalidate(data.load_comments, data.load_sentiment, data.load_feedback_index)
+            self.versions["comments"] += 1
+
+        self.versions["placements"] += 1
+        logger.info("Appended placement records from %s: %s", files, stats.summary())
+        return f"{len(delta):,} new placement records"
+
+    def _comments_cached(self, source):
+        return data.load_comments.cached(self.seed, source) and data.load_sentiment.cached(self.seed, source)
+
+    def _merge_comments(self, comments, scored, new_comments, source):
+        seed = self.seed
+        new_comments = pd.Series(new_comments, dtype="category")
+        # Seuls les nouveaux commentaires sont scorés
+        data.load_comments.update(pd.Series(union_categoricals([comments, new_comments], ignore_order=True)),
+                                  seed, source)
+        data.load_sentiment.update(pd.concat([scored, get_engine().score(new_comments)], ignore_index=True),
+                                   seed, source)
+        # Index de recherche reconstruit à la prochaine lecture
+        data.invalidate(data.load_feedback_index)
+
+    def _append_comments(self, files):
+        source, seed = self.comments_source, self.seed
+        comments, scored = data.load_comments(seed, source), data.load_sentiment(seed, source)
+        new_comments = data.read_comments(files)
+        self._merge_comments(comments, scored, new_comments, source)
+        self.versions["comments"] += 1
+        return f"{len(new_comments):,} new comments"
+
+
+@st.cache_resource(show_spinner=False)
+def get_refresher():
+    return DataRefresher()
@@ -0,0 +1,103 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from profiling import timed
+
+# Nombre de threads de calcul des artefacts (partagés par toutes les sessions),
+# par défaut un par cœur disponible, dans la limite de 4
+MAX_WORKERS = int(os.environ.get("ARTIFACT_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+@dataclass(frozen=True)
+class Task:
+    """Calcul d'un artefact (ou d'un jeu de données), avec les tâches dont il dépend."""
+
+    name: str
+    run: object
+    depends: tuple = ()
+    cached: object = None  # callable : vrai si le résultat est déjà en cache
+
+
+class ArtifactScheduler:
+    """Exécute en parallèle les tâches d'un graphe de dépendances.
+
+    Une tâche est soumise au pool dès que toutes ses dépendances sont
+    terminées ; une tâche dont le résultat est déjà en cache est considérée
+    terminée sans être soumise.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact")
+
+    @staticmethod
+    def _closure(tasks, names):
+        # Tâches demandées et, récursivement, leurs dépendances
+        selected, stack = set(), list(names)
+        while stack:
+            name = stack.pop()
+            if name not in selected:
+                selected.add(name)
+                stack.extend(tasks[name].depends)
+        return selected
+
+    def _call(self, task, ctx):
+        # Contexte de la session : les mesures de profiling.timed lui sont rattachées
+        thread = threading.current_thread()
+        add_script_run_ctx(thread, ctx)
+        try:
+            with timed(f"build {task.name}"):
+                return task.run()
+        finally:
+            add_script_run_ctx(thread, None)
+
+    def run(self, tasks, names):
+        """Lance les tâches `names` (et leurs dépendances) ; renvoie {nom: Future}."""
+        tasks = {task.name: task for task in tasks}
+        selected = self._closure(tasks, names)
+        futures = {name: Future() for name in selected}
+        waiting = {name: set(tasks[name].depends) for name in selected}
+        lock = threading.Lock()
+        ctx = get_script_run_ctx()
+
+        def complete(name, work):
+            if work.exception() is not None:
+                futures[name].set_exception(work.exception())
+            else:
+                futures[name].set_result(work.result())
+            ready = []
+            with lock:
+                for other, depends in waiting.items():
+                    if name in depends:
+                        depends.discard(name)
+                        if not depends:
+                            ready.append(other)
+            # En cas d'échec, les tâches dépendantes s'exécutent quand même :
+            # l'erreur remonte là où le résultat est utilisé
+            for other in ready:
+                start(other)
+
+        def start(name):
+            task = tasks[name]
+            if task.cached is not None and task.cached():
+                done = Future()
+                done.set_result(None)
+                complete(name, done)
+            else:
+                work = self._pool.submit(self._call, task, ctx)
+                work.add_done_callback(lambda work: complete(name, work))
+
+        with lock:
+            roots = [name for name, depends in waiting.items() if not depends]
+        for name in roots:
+            start(name)
+        return futures
+
+
+@st.cache_resource(show_spinner=False)
+def get_scheduler():
+    return ArtifactScheduler()
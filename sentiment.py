@@ -0,0 +1,137 @@
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from profiling import import_module, timed
+
+# Cache persistant des scores (une ligne par commentaire unique)
+CACHE_PATH = Path(os.environ.get("SENTIMENT_CACHE_PATH",
+                                 Path(__file__).parent / ".cache" / "sentiment.sqlite"))
+
+# Taille des lots envoyés aux processus de scoring
+BATCH_SIZE = 2000
+
+# En dessous de ce nombre de commentaires à scorer, le pool de processus coûte
+# plus cher qu'il ne rapporte : on score directement dans le processus courant
+PARALLEL_THRESHOLD = 5000
+
+SENTIMENT_LABELS = ["Positive", "Neutral", "Negative"]
+
+
+def comment_hash(comment):
+    return hashlib.sha256(comment.encode("utf-8")).hexdigest()
+
+
+def _score_batch(comments):
+    # Exécuté dans les processus du pool : doit rester au niveau du module
+    from textblob import TextBlob
+
+    return [TextBlob(comment).sentiment.polarity for comment in comments]
+
+
+def categorize(scores):
+    """Catégorise les polarités : Positive (> 0.1), Neutral (>= -0.1), Negative."""
+    scores = np.asarray(scores, dtype=float)
+    # Codes calculés directement : pas de tableau de libellés à refactoriser
+    codes = np.select([scores > 0.1, scores >= -0.1], [0, 1], 2).astype(np.int8)
+    return pd.Categorical.from_codes(codes, categories=SENTIMENT_LABELS)
+
+
+class SentimentEngine:
+    """Moteur de scoring par lots, avec cache des scores par empreinte de contenu."""
+
+    def __init__(self, cache_path=CACHE_PATH, batch_size=BATCH_SIZE,
+                 parallel_threshold=PARALLEL_THRESHOLD, max_workers=None):
+        self.cache_path = Path(cache_path)
+        self.batch_size = batch_size
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._memory = {}
+        self._db = self._connect()
+
+    def _connect(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.cache_path, check_same_thread=False)
+        except (OSError, sqlite3.Error):
+            # Sans cache disque, les scores restent en mémoire pour la durée du processus
+            db = sqlite3.connect(":memory:", check_same_thread=False)
+        db.execute("CREATE TABLE IF NOT EXISTS scores (hash TEXT PRIMARY KEY, polarity REAL NOT NULL)")
+        db.commit()
+        return db
+
+    def _lookup(self, hashes):
+        missing = [h for h in hashes if h not in self._memory]
+        # Requêtes par paquets pour rester sous la limite de paramètres SQLite
+        for start in range(0, len(missing), 900):
+            chunk = missing[start:start + 900]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT hash, polarity FROM scores WHERE hash IN ({placeholders})", chunk)
+            self._memory.update(rows)
+
+    def _store(self, scored):
+        self._memory.update(scored)
+        self._db.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?)", scored.items())
+        self._db.commit()
+
+    def _score_missing(self, comments):
+        batches = [comments[start:start + self.batch_size]
+                   for start in range(0, len(comments), self.batch_size)]
+        if len(comments) < self.parallel_threshold:
+            results = map(_score_batch, batches)
+        else:
+            # forkserver : un fork du serveur multithread pourrait hériter de verrous détenus
+            context = multiprocessing.get_context("forkserver")
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as pool:
+                results = list(pool.map(_score_batch, batches))
+        return [score for batch in results for score in batch]
+
+    def score(self, comments):
+        """Score les commentaires et renvoie un DataFrame typé.
+
+        Seuls les commentaires jamais vus (ni en mémoire, ni dans le cache disque)
+        sont envoyés au scoring : un nouvel arrivage ne coûte que ses nouveaux textes.
+        """
+        # Chaque texte distinct n'est haché (et scoré) qu'une fois ; des commentaires
+        # déjà catégoriels (data.load_comments) sont repris sans nouvelle factorisation
+        if isinstance(getattr(comments, "dtype", None), pd.CategoricalDtype):
+            comments = pd.Series(comments)
+            codes, uniques = comments.cat.codes.to_numpy(), comments.cat.categories
+        else:
+            codes, uniques = pd.factorize(pd.Series(list(comments), dtype=object))
+        hashes = [comment_hash(comment) for comment in uniques]
+
+        with self._lock:
+            self._lookup(hashes)
+            pending = {h: comment for h, comment in zip(hashes, uniques) if h not in self._memory}
+            if pending:
+                # textblob n'est importé qu'au premier commentaire à scorer
+                import_module("textblob")
+                with timed("TextBlob scoring"):
+                    scores = self._score_missing(list(pending.values()))
+                self._store(dict(zip(pending.keys(), scores)))
+            unique_polarity = np.fromiter((self._memory[h] for h in hashes), dtype=float,
+                                          count=len(hashes))
+
+        # Catégorisation sur les scores en float64 (en float32, 0.1 dépasserait le seuil) ;
+        # seule la colonne conservée est compactée
+        polarity = unique_polarity[codes]
+        return pd.DataFrame({
+            "Comment": pd.Categorical.from_codes(codes, uniques),
+            "Sentiment Score": polarity.astype(np.float32),
+            "Sentiment": categorize(polarity),
+        })
+
+
+@st.cache_resource(show_spinner=False)
+def get_engine():
+    return SentimentEngine()
@@ -0,0 +1,229 @@
+import functools
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Budget mémoire du magasin partagé (en Mo) et durée de vie par défaut des entrées
+BUDGET_MB = float(os.environ.get("SHARED_STORE_BUDGET_MB", 512))
+DEFAULT_TTL = 3600
+
+
+def sizeof(value, _seen=None):
+    """Estimation (en octets) de la mémoire occupée par un jeu de données ou une figure."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k, seen) + sizeof(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(item, seen) for item in value)
+    if hasattr(value, "to_plotly_json"):
+        # Figures Plotly : taille de leur arborescence de propriétés
+        return sizeof(value.to_plotly_json(), seen)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + sizeof(vars(value), seen)
+    return sys.getsizeof(value)
+
+
+def freeze(key):
+    """Clé hachable équivalente (listes, ensembles et dictionnaires figés)."""
+    if isinstance(key, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in key.items()))
+    if isinstance(key, (list, tuple)):
+        return tuple(freeze(item) for item in key)
+    if isinstance(key, (set, frozenset)):
+        return tuple(sorted(freeze(item) for item in key))
+    return key
+
+
+@dataclass
+class _Entry:
+    value: object
+    size: int
+    expires: float
+    pinned: bool = False
+
+
+@dataclass
+class _Build:
+    # Verrou du calcul d'une clé et nombre de sessions qui le détiennent ou l'attendent
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    waiters: int = 0
+
+
+class SharedStore:
+    """Magasin en lecture seule, partagé par toutes les sessions du processus.
+
+    Les valeurs (jeux de données, agrégats, figures) ne sont jamais copiées :
+    chaque session reçoit le même objet et ne doit pas le modifier. Les entrées
+    sont évincées par ancienneté d'utilisation (LRU) au-delà du budget mémoire,
+    et à l'expiration de leur durée de vie (TTL). Les entrées épinglées (jeux de
+    base, coûteux à relire) échappent à l'éviction LRU mais comptent dans le budget.
+    """
+
+    def __init__(self, budget_bytes=BUDGET_MB * 2**20, ttl=DEFAULT_TTL):
+        self.budget_bytes = budget_bytes
+        self.ttl = ttl
+        self.hits = self.misses = self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Un verrou par clé en cours de calcul : deux sessions ne calculent
+        # jamais la même entrée en même temps. Il est conservé tant qu'une
+        # session le détient ou l'attend
+        self._building = {}
+        # Clés mises à jour ou invalidées pendant leur calcul : le résultat,
+        # calculé à partir de données périmées, n'est pas conservé
+        self._stale = set()
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _evict(self, key):
+        entry = self._entries.pop(key)
+        self.nbytes -= entry.size
+        self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires > time.monotonic()
+
+    def get_or_build(self, key, builder, *args, ttl=None, pinned=False, **kwargs):
+        """Renvoie la valeur de `key`, calculée par `builder(*args, **kwargs)` si absente."""
+        with self._lock:
+            entry = self._get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry.value
+            building = self._building.setdefault(key, _Build())
+            building.waiters += 1
+
+        try:
+            with building.lock:
+                with self._lock:
+                    # Calculée entre-temps par une autre session
+                    entry = self._get(key)
+                    if entry is not None:
+                        self.hits += 1
+                        return entry.value
+                    self.misses += 1
+                    self._stale.discard(key)
+                value = builder(*args, **kwargs)
+                self._put(key, value, ttl, pinned, built=True)
+                return value
+        finally:
+            with self._lock:
+                building.waiters -= 1
+                if not building.waiters:
+                    del self._building[key]
+                    self._stale.discard(key)
+
+    def put(self, key, value, ttl=None, pinned=False):
+        """Enregistre `value` sous `key` ; un calcul de `key` déjà en cours ne l'écrasera pas."""
+        self._put(key, value, ttl, pinned, built=False)
+
+    def _put(self, key, value, ttl, pinned, built):
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        size = sizeof(value)
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if built and key in self._stale:
+                return
+            if not built and key in self._building:
+                self._stale.add(key)
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key).size
+            self._entries[key] = _Entry(value, size, expires, pinned)
+            self.nbytes += size
+            # Éviction LRU des entrées non épinglées jusqu'à revenir sous le budget ;
+            # l'entrée insérée n'est jamais évincée (elle serait recalculée à chaque accès)
+            for other in [k for k, e in self._entries.items() if not e.pinned and k != key]:
+                if self.nbytes <= self.budget_bytes:
+                    break
+                self._evict(other)
+            if self.nbytes > self.budget_bytes:
+                logger.warning("Shared store over budget (%.1f MiB > %.1f MiB) after storing %r",
+                               self.nbytes / 2**20, self.budget_bytes / 2**20, key[0])
+
+    def invalidate(self, prefix=()):
+        """Retire les entrées dont la clé commence par `prefix` (toutes par défaut)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[:len(prefix)] == prefix]:
+                self.nbytes -= self._entries.pop(key).size
+            # Calculs en cours à partir des données invalidées : résultats écartés
+            self._stale.update(k for k in self._building if k[:len(prefix)] == prefix)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_mb": round(self.nbytes / 2**20, 1),
+                "pinned_mb": round(sum(e.size for e in self._entries.values() if e.pinned) / 2**20, 1),
+                "budget_mb": round(self.budget_bytes / 2**20, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    return SharedStore()
+
+
+def shared(ttl=None, pinned=False):
+    """Décorateur : met en cache le résultat de la fonction dans le magasin partagé.
+
+    Comme avec st.cache_data, la fonction décorée expose `.clear()` (ainsi que
+    `.update(valeur, *args)` et `.cached(*args)`) ; mais le résultat n'est ni
+    sérialisé ni copié à chaque accès. `pinned` : résultats exclus de l'éviction LRU.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+
+        def key(args, kwargs):
+            # Arguments normalisés : f() et f(valeur_par_défaut) partagent la même entrée
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (name, freeze(tuple(bound.arguments.items())))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return get_store().get_or_build(key(args, kwargs), func, *args, ttl=ttl, pinned=pinned, **kwargs)
+
+        def update(value, *args, **kwargs):
+            """Remplace le résultat mis en cache pour ces arguments (mise à jour incrémentale)."""
+            get_store().put(key(args, kwargs), value, ttl, pinned)
+
+        wrapper.clear = lambda: get_store().invalidate((name,))
+        wrapper.update = update
+        wrapper.cached = lambda *args, **kwargs: key(args, kwargs) in get_store()
+        return wrapper
+    return decorator
@@ -0,0 +1,181 @@
+"""Générateur de données synthétiques (une ligne par étudiant) pour les tests de charge.
+
+Les enregistrements sont générés par blocs, de façon vectorisée et reproductible
+(même graine et même taille de bloc, mêmes données), puis écrits en Parquet, un
+fichier par bloc. Le répertoire produit s'utilise directement comme source :
+
+    python synthetic.py --rows 10000000 --output data/synthetic
+    PLACEMENTS_SOURCE=data/synthetic streamlit run app.py
+"""
+import argparse
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data import (COHORTS, COMPANIES, COUNTRY_ISO3, COUNTRY_WEIGHTS, DEGREE_LEVELS, JOB_TITLES,
+                  SECTOR_JOB_TITLES, SECTORS, YEARS)
+
+# Nombre d'étudiants générés (et écrits) à la fois
+CHUNK_ROWS = 1_000_000
+
+# Part des étudiants ayant laissé un commentaire
+COMMENT_RATE = 0.3
+
+# Coordonnées approximatives des pays de recrutement (pour les données géolocalisées)
+COUNTRY_CENTROIDS = {
+    "Morocco": (31.8, -7.1),
+    "France": (46.6, 2.4),
+    "USA": (39.8, -98.6),
+    "Germany": (51.2, 10.4),
+    "Canada": (56.1, -106.3),
+    "Senegal": (14.5, -14.5),
+    "Ivory Coast": (7.5, -5.5),
+    "Nigeria": (9.1, 8.7),
+    "Kenya": (0.0, 37.9),
+    "Ghana": (7.9, -1.0),
+    "Mali": (17.6, -4.0),
+    "South Africa": (-30.6, 22.9),
+    "Cameroon": (7.4, 12.4),
+}
+
+# Commentaires libres : chaque sujet est combiné avec une appréciation de chaque tonalité
+COMMENT_SUBJECTS = ["The career services", "The mentorship sessions", "The job fairs",
+                    "The coaching sessions", "The alumni events", "The internship offers",
+                    "The resume reviews", "The career advisors"]
+COMMENT_PREDICATES = {
+    "positive": ["are amazing!", "were extremely helpful.", "made a great difference for me.",
+                 "are excellent and well organized."],
+    "neutral": ["are decent.", "were okay overall.", "meet my basic needs.", "could be better."],
+    "negative": ["are disappointing.", "were not helpful at all.", "lack real opportunities.",
+                 "are poorly organized."],
+}
+COMMENTS = [f"{subject} {predicate}" for predicates in COMMENT_PREDICATES.values()
+            for predicate in predicates for subject in COMMENT_SUBJECTS]
+
+
+def _rng(seed, *keys):
+    return np.random.default_rng([seed, zlib.crc32(b"synthetic"), *keys])
+
+
+def _parameters(seed):
+    # Paramètres communs à tous les blocs : les taux ne dépendent pas du découpage
+    rng = _rng(seed, 0)
+    return {
+        "sector_rate": rng.uniform(0.55, 0.85, size=len(SECTORS)),
+        "degree_bonus": np.array([0.0, 0.08, -0.05]),
+        "company_weights": rng.dirichlet(np.full(len(COMPANIES), 2.0)),
+    }
+
+
+def _title_table():
+    # Table (secteur, rang) -> code du métier, et nombre de métiers par secteur
+    n_titles = np.array([len(SECTOR_JOB_TITLES[s]) for s in SECTORS])
+    table = np.zeros((len(SECTORS), n_titles.max()), dtype=np.int8)
+    for i, sector in enumerate(SECTORS):
+        table[i, :n_titles[i]] = [JOB_TITLES.index(t) for t in SECTOR_JOB_TITLES[sector]]
+    return table, n_titles
+
+
+def generate_chunk(size, seed, index=0, start_id=0, coordinates=False, params=None):
+    """Bloc de `size` enregistrements (numéro de bloc `index`), au schéma compact d'ingest.py."""
+    params = params or _parameters(seed)
+    rng = _rng(seed, 1, index)
+
+    # Tirages convertis aussitôt en codes compacts : les temporaires int64 d'un
+    # bloc ne restent pas en mémoire jusqu'à la construction du DataFrame
+    sector = rng.integers(0, len(SECTORS), size=size).astype(np.int8)
+    degree = rng.choice(len(DEGREE_LEVELS), size=size, p=[0.5, 0.4, 0.1]).astype(np.int8)
+    weights = np.asarray(COUNTRY_WEIGHTS, dtype=float)
+    country = rng.choice(len(COUNTRY_ISO3), size=size, p=weights / weights.sum()).astype(np.int8)
+    company = rng.choice(len(COMPANIES), size=size, p=params["company_weights"]).astype(np.int8)
+
+    # Probabilité de placement : un niveau propre à chaque secteur, modulé par le diplôme
+    rate = np.clip(params["sector_rate"][sector] + params["degree_bonus"][degree], 0, 1)
+    placed = rng.random(size) < rate
+
+    # Métier tiré parmi ceux du secteur
+    table, n_titles = _title_table()
+    job_title = table[sector, rng.integers(0, n_titles[sector])]
+
+    # Satisfaction (0-100), plus élevée chez les étudiants placés
+    satisfaction = np.clip(rng.normal(62, 12, size=size) + 14 * placed, 0, 100).round().astype(np.float32)
+
+    # Commentaire facultatif, dont la tonalité suit la satisfaction
+    tone = np.select([satisfaction >= 70, satisfaction >= 50], [0, 1], 2)
+    per_tone = len(COMMENTS) // len(COMMENT_PREDICATES)
+    comment = (tone * per_tone + rng.integers(0, per_tone, size=size)).astype(np.int8)
+    comment[rng.random(size) >= COMMENT_RATE] = -1
+
+    records = {
+        "student_id": np.arange(start_id, start_id + size, dtype=np.uint32),
+        "year": rng.choice(YEARS, size=size).astype(np.int16),
+        "cohort": pd.Categorical.from_codes(rng.integers(0, len(COHORTS), size=size).astype(np.int8), COHORTS),
+        "sector": pd.Categorical.from_codes(sector, SECTORS),
+        "degree_level": pd.Categorical.from_codes(degree, DEGREE_LEVELS),
+        "country": pd.Categorical.from_codes(country, list(COUNTRY_ISO3)),
+        "company": pd.Categorical.from_codes(company, COMPANIES),
+        "placed": placed,
+        "job_title": pd.Categorical.from_codes(job_title, JOB_TITLES),
+        "satisfaction": satisfaction,
+        "comment": pd.Categorical.from_codes(comment, COMMENTS),
+    }
+    if coordinates:
+        centroids = np.array([COUNTRY_CENTROIDS[c] for c in COUNTRY_ISO3], dtype=np.float32)
+        jitter = rng.normal(0, 2.0, size=(size, 2)).astype(np.float32)
+        records["lat"], records["lon"] = (centroids[country] + jitter).T
+    return pd.DataFrame(records)
+
+
+def generate(rows, seed, chunk_rows=CHUNK_ROWS, coordinates=False):
+    """Génère `rows` enregistrements par blocs de `chunk_rows` (itérateur de DataFrames)."""
+    params = _parameters(seed)
+    for index, start in enumerate(range(0, rows, chunk_rows)):
+        size = min(chunk_rows, rows - start)
+        yield generate_chunk(size, seed, index, start, coordinates, params)
+
+
+def generate_records(rows, seed, chunk_rows=CHUNK_ROWS, coordinates=False):
+    """Enregistrements générés en mémoire, en un seul DataFrame."""
+    chunks = list(generate(rows, seed, chunk_rows, coordinates))
+    if len(chunks) == 1:
+        # Un seul bloc : pas de copie par pd.concat
+        return chunks[0]
+    # Catégories identiques d'un bloc à l'autre : la concaténation reste catégorielle
+    return pd.concat(chunks, ignore_index=True)
+
+
+def write_parquet(output, rows, seed, chunk_rows=CHUNK_ROWS, coordinates=False):
+    """Écrit les enregistrements dans `output`, un fichier Parquet par bloc ; renvoie les chemins."""
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index, chunk in enumerate(generate(rows, seed, chunk_rows, coordinates)):
+        path = output / f"part-{index:05d}.parquet"
+        chunk.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, required=True, help="number of student records")
+    parser.add_argument("--output", type=Path, required=True, help="directory of Parquet files")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--coordinates", action="store_true", help="add lat/lon columns (hexagon map)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = write_parquet(args.output, args.rows, args.seed, args.chunk_rows, args.coordinates)
+    size_mb = sum(path.stat().st_size for path in paths) / 2**20
+    print(f"Wrote {args.rows:,} records to {len(paths)} file(s) in {args.output} "
+          f"({size_mb:.1f} MiB, {time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import threading
+import time
+
+import numpy as np
+
+from store import SharedStore
+
+
+# Délai laissé à une session pour atteindre le verrou du calcul en cours
+BLOCK_DELAY = 0.1
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+class Source:
+    """Jeu de données versionné dont chaque calcul attend d'être libéré par le test."""
+
+    def __init__(self):
+        self.version = 1
+        self.calls = []
+        self.running = self.max_running = 0
+        self._lock = threading.Lock()
+
+    def build(self):
+        release = threading.Event()
+        with self._lock:
+            self.calls.append(release)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        # Données lues au début du calcul, comme un loader
+        version = self.version
+        release.wait(5)
+        with self._lock:
+            self.running -= 1
+        return version
+
+
+def start(store, key, source, results):
+    thread = threading.Thread(target=lambda: results.append(store.get_or_build(key, source.build)))
+    thread.start()
+    return thread
+
+
+def test_waiting_build_stays_tracked_after_first_builder_leaves():
+    store, source, results = SharedStore(), Source(), []
+    key = ("data",)
+
+    a = start(store, key, source, results)
+    wait_until(lambda: len(source.calls) == 1)
+    b = start(store, key, source, results)
+    time.sleep(BLOCK_DELAY)
+
+    # Données invalidées pendant le calcul de A : son résultat est écarté
+    source.version = 2
+    store.invalidate()
+    source.calls[0].set()
+    a.join(5)
+
+    # B prend le relais et lit la version 2, puis les données changent encore
+    wait_until(lambda: len(source.calls) == 2)
+    source.version = 3
+    store.invalidate()
+
+    # C attend le calcul de B au lieu d'en lancer un autre en parallèle
+    c = start(store, key, source, results)
+    time.sleep(BLOCK_DELAY)
+    assert source.running == 1
+
+    source.calls[1].set()
+    b.join(5)
+    wait_until(lambda: len(source.calls) == 3)
+    source.calls[2].set()
+    c.join(5)
+
+    assert source.max_running == 1
+    assert store.get_or_build(key, source.build) == 3
+    assert key not in store._building and not store._stale
+
+
+def test_put_during_build_is_not_overwritten():
+    store, source, results = SharedStore(), Source(), []
+    key = ("data",)
+
+    thread = start(store, key, source, results)
+    wait_until(lambda: len(source.calls) == 1)
+    store.put(key, "updated")
+    source.calls[0].set()
+    thread.join(5)
+
+    assert store.get_or_build(key, source.build) == "updated"
+    assert len(source.calls) == 1
+
+
+def test_concurrent_sessions_build_an_entry_once():
+    store, calls = SharedStore(), []
+    barrier = threading.Barrier(8)
+
+    def build():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    def session(results):
+        barrier.wait()
+        results.append(store.get_or_build(("data",), build))
+
+    results = []
+    threads = [threading.Thread(target=session, args=(results,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+    assert store.stats()["misses"] == 1
+
+
+def block(nbytes=1024):
+    return np.zeros(nbytes, dtype=np.uint8)
+
+
+def test_least_recently_used_entries_are_evicted_over_budget():
+    store = SharedStore(budget_bytes=3 * 1024)
+    for name in "abc":
+        store.put((name,), block())
+    # Accès à « a » : « b » devient la moins récemment utilisée
+    store.get_or_build(("a",), block)
+    store.put(("d",), block())
+
+    assert ("b",) not in store
+    assert all((name,) in store for name in "acd")
+    assert store.nbytes <= store.budget_bytes
+
+
+def test_pinned_entries_are_never_evicted():
+    store = SharedStore(budget_bytes=2 * 1024)
+    # Jeu de base épinglé : il reste en mémoire quel que soit l'ordre d'utilisation
+    store.put(("base",), block(), pinned=True)
+    for name in "abc":
+        store.put((name,), block())
+
+    assert ("base",) in store
+    assert ("c",) in store
+
+
+def test_entry_larger_than_budget_is_kept(caplog):
+    store = SharedStore(budget_bytes=1024)
+    store.put(("small",), block(512))
+    value = store.get_or_build(("large",), block, 4096)
+
+    assert store.get_or_build(("large",), block, 4096) is value
+    assert ("small",) not in store
+    assert "over budget" in caplog.text
+
+
+def test_expired_entries_are_rebuilt():
+    store, calls = SharedStore(), []
+
+    def build():
+        calls.append(1)
+        return len(calls)
+
+    assert store.get_or_build(("data",), build, ttl=0.05) == 1
+    assert store.get_or_build(("data",), build, ttl=0.05) == 1
+    time.sleep(0.06)
+    assert store.get_or_build(("data",), build, ttl=0.05) == 2
+
+
+def test_invalidate_removes_entries_by_prefix():
+    store = SharedStore()
+    store.put(("artifact", "pie"), block())
+    store.put(("artifact", "map"), block())
+    store.put(("data", "cube"), block())
+    store.invalidate(("artifact",))
+
+    assert ("data", "cube") in store
+    assert ("artifact", "pie") not in store and ("artifact", "map") not in store
+    assert store.nbytes == block().nbytes
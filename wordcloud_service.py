@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+from PIL import Image
+from profiling import import_module, timed
+
+# Répertoire du cache disque (réutilisé après un redémarrage du processus)
+CACHE_DIR = Path(os.environ.get("WORDCLOUD_CACHE_DIR",
+                                Path(__file__).parent / ".cache" / "wordcloud"))
+
+# Nombre de rendus conservés en mémoire
+MAX_ITEMS = 32
+
+# Nombre de rendus conservés sur disque (un par combinaison de filtres, 30 à 65 Ko
+# chacun) ; au-delà, les moins récemment utilisés sont supprimés
+MAX_DISK_ITEMS = int(os.environ.get("WORDCLOUD_CACHE_FILES", 500))
+
+
+def render_key(frequencies, options):
+    """Empreinte de la table de fréquences et des options de rendu."""
+    payload = json.dumps({"frequencies": sorted(frequencies.items()),
+                          "options": sorted(options.items())},
+                         default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class WordCloudRenderer:
+    """Service de rendu de nuages de mots avec cache LRU mémoire + cache disque.
+
+    Partagé par toutes les sessions et par les threads de l'ordonnanceur : le
+    cache mémoire est protégé par un verrou ; le rendu lui-même se fait hors verrou.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_items=MAX_ITEMS, max_disk_items=MAX_DISK_ITEMS):
+        self.cache_dir = Path(cache_dir)
+        self.max_items = max_items
+        self.max_disk_items = max_disk_items
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+
+    def render(self, frequencies, **options):
+        """Renvoie l'image (tableau RGB) du nuage de mots pour ces fréquences."""
+        key = render_key(frequencies, options)
+
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                return image
+
+        path = self.cache_dir / f"{key}.png"
+        if path.exists():
+            image = np.asarray(Image.open(path))
+            # Date de modification = date du dernier usage (éviction LRU du cache disque)
+            self._touch(path)
+        else:
+            # Fréquences précalculées : pas de re-tokenisation du texte
+            # wordcloud n'est importé qu'au premier rendu réellement nécessaire
+            WordCloud = import_module("wordcloud").WordCloud
+            with timed("WordCloud.generate"):
+                wordcloud = WordCloud(**options).generate_from_frequencies(frequencies)
+                image = wordcloud.to_array()
+            self._write(path, image)
+
+        image.setflags(write=False)
+        with self._lock:
+            self._memory[key] = image
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+        return image
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _write(self, path, image):
+        # Écriture atomique : un rendu concurrent ne lit jamais un PNG partiel
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+            Image.fromarray(image).save(tmp_path, format="PNG")
+            os.replace(tmp_path, path)
+            self._prune()
+        except OSError:
+            # Le cache disque est optionnel (système de fichiers en lecture seule, etc.)
+            pass
+
+    def _prune(self):
+        # Suppression des rendus les moins récemment utilisés au-delà de max_disk_items
+        files = []
+        for path in self.cache_dir.glob("*.png"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.max_disk_items)]:
+            path.unlink(missing_ok=True)
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._memory.clear()
+        if disk and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.png"):
+                path.unlink(missing_ok=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_renderer():
+    return WordCloudRenderer()